@@ -0,0 +1,182 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import resource
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+import TBTFEuro as Modul
+
+def LavTurnering(Mappe, BudKilde=None):
+    # Laver et TBTFEuro-objekt der læser filerne i Mappe
+    MappeFør = os.getcwd()
+    os.chdir(Mappe) # Filerne findes ud fra mappen når objektet laves
+    try:
+        return Modul.TBTFEuro(BudKilde=BudKilde)
+    finally:
+        os.chdir(MappeFør)
+
+def Kampdage(Turnering):
+    # Sorterer gruppekampene i runder som i en rigtig turnering, så delvist spillede grupper ser realistiske ud
+    Runde = np.tile([0, 1, 2, 2, 1, 0], len(Turnering.GruppeHold)) # Runden for kampene fra combinations i hver gruppe
+    Gruppe = np.repeat(np.arange(len(Turnering.GruppeHold)), 6)
+    return np.lexsort((Gruppe, Runde))
+
+def LavData(Mappe, AntalBois, AntalGrupper=6, AntalKampe=36, AntalSlutspilKampe=0, ExcelGrænse=200, Frø=2024):
+    # Skriver syntetiske resultater og bud i samme format som Resultater.xlsx, Bud.xlsx, Slutspil.xlsx og SlutspilBud.xlsx
+    rng = np.random.default_rng(Frø)
+    os.makedirs(Mappe, exist_ok=True)
+    Turnering = Modul.TBTFEuro()
+    Hold = np.array(Turnering.Hold, dtype=object)
+
+    # Resultater for de første kampe i de første grupper
+    Kampe = Turnering.Kampe[Kampdage(Turnering)]
+    Kampe = Kampe[np.isin(Kampe[:, 0], Turnering.GruppeHold[:AntalGrupper])][:AntalKampe]
+    Mål = rng.poisson(1.3, size=Kampe.shape)
+    Resultater = pd.DataFrame({'Hold 1': Hold[Kampe[:, 0]], 'Hold 2': Hold[Kampe[:, 1]], 'Mål 1': Mål[:, 0], 'Mål 2': Mål[:, 1]})
+    Resultater.to_excel(os.path.join(Mappe, 'Resultater.xlsx'), header=False, index=False)
+
+    # Bud på alle gruppekampe, som Excel-ark pr. boi i små puljer og ellers som én lang CSV-fil
+    Bois = [f'Boi {b}' for b in range(AntalBois)]
+    bMål = rng.poisson(1.3, size=(AntalBois,) + Turnering.Kampe.shape)
+    if AntalBois <= ExcelGrænse:
+        with pd.ExcelWriter(os.path.join(Mappe, 'Bud.xlsx')) as Fil:
+            for b, boi in enumerate(Bois):
+                pd.DataFrame({
+                    'Hold 1': Hold[Turnering.Kampe[:, 0]], 'Hold 2': Hold[Turnering.Kampe[:, 1]],
+                    'Mål 1': bMål[b, :, 0], 'Mål 2': bMål[b, :, 1]
+                }).to_excel(Fil, sheet_name=boi, header=False, index=False)
+        BudKilde = None
+    else:
+        BudKilde = os.path.join(Mappe, 'Bud.csv')
+        pd.DataFrame({
+            'Boi': np.repeat(Bois, len(Turnering.Kampe)),
+            'Hold 1': np.tile(Hold[Turnering.Kampe[:, 0]], AntalBois), 'Hold 2': np.tile(Hold[Turnering.Kampe[:, 1]], AntalBois),
+            'Mål 1': bMål[..., 0].ravel(), 'Mål 2': bMål[..., 1].ravel()
+        }).to_csv(BudKilde, index=False)
+
+    # Slutspillet spilles først når gruppespillet er slut, programmet udledes af gruppestillingen
+    Kolonner = ['Hold 1', 'Hold 2', 'Mål 1', 'Mål 2', 'Forlænget 1', 'Forlænget 2', 'Straffe 1', 'Straffe 2']
+    Slutspil = pd.DataFrame(columns=Kolonner)
+    Slutspil.to_excel(os.path.join(Mappe, 'Slutspil.xlsx'), index=False)
+    if AntalKampe >= len(Turnering.Kampe) and AntalGrupper >= len(Turnering.GruppeHold):
+        Runde = [list(Par) for Par in LavTurnering(Mappe).Ottendedelsfinaler]
+
+        Rækker = [] # Hele slutspillet afvikles, og kun de første kampe får resultater
+        while Runde:
+            Vindere = []
+            for Hold1, Hold2 in Runde:
+                Taber = rng.poisson(1.0)
+                Vinder = Taber + 1 + rng.poisson(0.5)
+                Hold1Vinder = rng.random() < 0.5
+                Rækker.append([Hold1, Hold2, Vinder if Hold1Vinder else Taber, Taber if Hold1Vinder else Vinder] + [np.nan] * 4)
+                Vindere.append(Hold1 if Hold1Vinder else Hold2)
+            Runde = [Vindere[i:i + 2] for i in range(0, len(Vindere), 2)] if len(Vindere) > 1 else []
+        Rækker = Rækker[:AntalSlutspilKampe] + [Række[:2] + [np.nan] * 6 for Række in Rækker[AntalSlutspilKampe:8]]
+
+        pd.DataFrame(Rækker, columns=Kolonner).to_excel(os.path.join(Mappe, 'Slutspil.xlsx'), index=False)
+
+    # Bud på slutspillet: 16, 8, 4, 2 og 1 hold, hvor hver runde er en delmængde af den forrige
+    with pd.ExcelWriter(os.path.join(Mappe, 'SlutspilBud.xlsx')) as Fil:
+        for boi in Bois[:ExcelGrænse]:
+            Runder = [rng.choice(Hold, 16, replace=False)]
+            for Antal in [8, 4, 2, 1]:
+                Runder.append(rng.choice(Runder[-1], Antal, replace=False))
+            pd.DataFrame({'Hold': np.concatenate(Runder)}).to_excel(Fil, sheet_name=boi, header=False, index=False)
+
+    return BudKilde
+
+Kvadratiske = {'_BeregnParvis'} # Trin med matricer af formen (bois, bois), 10000 bois fylder omkring 800 MB
+
+def Trinrækkefølge():
+    # Ordner trinnene så hvert trin kommer efter dem det afhænger af
+    Rækkefølge = []
+    def Besøg(trin):
+        if trin not in Rækkefølge:
+            for andet in Modul.TBTFEuro.Trin[trin][0]:
+                Besøg(andet)
+            Rækkefølge.append(trin)
+    for trin in Modul.TBTFEuro.Trin:
+        Besøg(trin)
+    return Rækkefølge
+
+def TagTid(Navn, Funktion, Resultater, Info):
+    # Tager tid og højeste hukommelsesforbrug for et kald
+    tracemalloc.reset_peak()
+    Før = tracemalloc.get_traced_memory()[0]
+    Start = time.perf_counter()
+    Funktion()
+    Sekunder = time.perf_counter() - Start
+    Top = tracemalloc.get_traced_memory()[1] - Før
+
+    Resultater.append(dict(Info, Trin=Navn, Sekunder=Sekunder, TopHukommelse=Top))
+    print(f"{Info['Bois']:>8} {Info['Gentagelse']:>3} {Navn:<40} {Sekunder:10.4f} s {Top / 2**20:10.1f} MB", flush=True)
+
+def KørBenchmark(Mappe, Info, BudKilde, AntalVisninger=3, Analyser=False, ParvisGrænse=2000):
+    # Kører alle trin for sig og derefter visningerne for nogle bois
+    # Kvadratiske trin springes over i puljer med flere end ParvisGrænse bois, hukommelsen vokser med bois i anden
+    Resultater = []
+    Turnering = LavTurnering(Mappe, BudKilde)
+
+    for trin in Trinrækkefølge():
+        if trin in Kvadratiske and Info['Bois'] > ParvisGrænse:
+            print(f"{Info['Bois']:>8} {Info['Gentagelse']:>3} {trin:<40} springes over, over {ParvisGrænse} bois", flush=True)
+            continue
+        TagTid(trin, lambda: Turnering._Kør(trin), Resultater, Info)
+
+    TagTid('_LavGrupperStillingHtml', Turnering._LavGrupperStillingHtml, Resultater, Info)
+    TagTid('_LavBoisStillingHtml', Turnering._LavBoisStillingHtml, Resultater, Info)
+    for boi in Turnering.GrupperBudBois[:AntalVisninger]:
+        TagTid('_LavGrupperStillingBoisHtml', lambda: Turnering._LavGrupperStillingBoisHtml(boi), Resultater, Info)
+        TagTid('_LavGrupperStillingBoisDiffHtml', lambda: Turnering._LavGrupperStillingBoisDiffHtml(boi), Resultater, Info)
+
+    if Analyser:
+        TagTid('_SimulerTurnering', lambda: Turnering._SimulerTurnering(10000, AntalProcesser=1), Resultater, Info)
+        Model = Turnering._LavSimuleringsModel()
+        if len(Model['RestHold']):
+            Kampe = [(Turnering.Hold[Hold1], Turnering.Hold[Hold2]) for Hold1, Hold2 in Model['RestHold'][:2]]
+            TagTid('_BeregnScenarier', lambda: Turnering._BeregnScenarier(Kampe, Modul.ScenarieGitter(len(Kampe))), Resultater, Info)
+
+    return Resultater
+
+def main():
+    Parser = argparse.ArgumentParser(description='Tager tid på hvert trin i TBTFEuro med syntetiske turneringer og bud')
+    Parser.add_argument('--bois', type=int, nargs='+', default=[7, 100, 1000, 10000, 100000], help='antal bois i puljerne')
+    Parser.add_argument('--grupper', type=int, default=6, help='antal grupper der er i gang (formatet har altid 6 grupper)')
+    Parser.add_argument('--kampe', type=int, default=36, help='antal spillede gruppekampe')
+    Parser.add_argument('--slutspil', type=int, default=8, help='antal spillede slutspilskampe')
+    Parser.add_argument('--gentagelser', type=int, default=2, help='kørsler pr. pulje, den første uden Excel-cache')
+    Parser.add_argument('--visninger', type=int, default=3, help='antal bois visningerne laves for')
+    Parser.add_argument('--excelgrænse', type=int, default=200, help='største pulje der skrives som Excel-ark pr. boi')
+    Parser.add_argument('--parvisgrænse', type=int, default=2000, help='største pulje de kvadratiske trin køres for')
+    Parser.add_argument('--analyser', action='store_true', help='tag også tid på simulering og scenarier')
+    Parser.add_argument('--mappe', default=None, help='mappe til de syntetiske filer, ellers en midlertidig mappe')
+    Parser.add_argument('--ud', default='Benchmark.json', help='fil til resultaterne')
+    Argumenter = Parser.parse_args()
+
+    tracemalloc.start()
+    Resultater = []
+    for AntalBois in Argumenter.bois:
+        Mappe = os.path.join(Argumenter.mappe or tempfile.mkdtemp(prefix='tbtf-'), f'bois-{AntalBois}')
+        BudKilde = LavData(Mappe, AntalBois, Argumenter.grupper, Argumenter.kampe, Argumenter.slutspil, Argumenter.excelgrænse)
+
+        for Gentagelse in range(Argumenter.gentagelser):
+            Info = {'Bois': AntalBois, 'Grupper': Argumenter.grupper, 'Kampe': Argumenter.kampe,
+                    'Slutspil': Argumenter.slutspil, 'Gentagelse': Gentagelse}
+            Resultater += KørBenchmark(Mappe, Info, BudKilde, Argumenter.visninger, Argumenter.analyser, Argumenter.parvisgrænse)
+
+    with open(Argumenter.ud, 'w', encoding='utf-8') as f:
+        json.dump({
+            'Python': sys.version.split()[0],
+            'NumPy': np.__version__,
+            'pandas': pd.__version__,
+            'TopRSS': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024, # Hele processens top, Linux angiver kB
+            'Resultater': Resultater
+        }, f, ensure_ascii=False, indent=1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+import json
+import argparse
+
+import TBTFEuro as Modul
+
+def main():
+    Parser = argparse.ArgumentParser(description='Scorer flere puljer mod de samme resultater ud fra en JSON-konfiguration')
+    Parser.add_argument('konfiguration', help='JSON-fil med fælles indstillinger og en liste "Puljer"')
+    Parser.add_argument('--processer', type=int, default=None, help='antal processer, 1 scorer puljerne i denne proces')
+    Parser.add_argument('--ud', default=None, help='fil til stillingerne som JSON, ellers skrives de til skærmen')
+    Argumenter = Parser.parse_args()
+
+    Stillinger = Modul.KørPuljer(Argumenter.konfiguration, Argumenter.processer)
+
+    if Argumenter.ud is None:
+        for Navn, Stilling in Stillinger.items():
+            print(Navn)
+            print(Stilling.to_string(index=False), end='\n\n')
+    else:
+        with open(Argumenter.ud, 'w', encoding='utf-8') as f:
+            json.dump({Navn: Stilling.to_dict('records') for Navn, Stilling in Stillinger.items()}, f, ensure_ascii=False, indent=1)
+
+if __name__ == '__main__':
+    main()
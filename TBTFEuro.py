@@ -1,422 +1,1556 @@
+import os
+import csv
+import json
+import glob
+import tempfile
+import asyncio
+import time
+import hashlib
+import sqlite3
+import zipfile
+import xml.etree.ElementTree as ET
+import tracemalloc
+import warnings
 import numpy as np
 import pandas as pd
 import scipy.stats as stats
 import matplotlib.pyplot as plt
-from itertools import combinations
+from itertools import combinations, repeat
+from concurrent.futures import ProcessPoolExecutor
 from IPython.display import display, HTML
 
+SlutspilRunder = { # Point pr. korrekt hold i hver runde af slutspillet
+    'Ottendedelsfinalister': 4,
+    'Kvartfinalister': 6,
+    'Semifinalister': 8,
+    'Finalister': 10,
+    'Vinder': 15
+}
+
+CacheMappe = '.cache' # Mappe til binære kopier af de indlæste Excel-filer
+
+BitTabel = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8) # Antal bits i hver byte
+
+def MaskeType(AntalHold):
+    # Mindste heltalstype med en bit til hvert hold, uint32 til EM og uint64 til op til 64 hold
+    return np.uint32 if AntalHold <= 32 else np.uint64
+
+def TælBits(Masker):
+    # Tæller bits i hver maske, med en opslagstabel over bytes på NumPy uden bitwise_count
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(Masker)
+    Masker = np.ascontiguousarray(Masker)
+    return BitTabel[Masker.view(np.uint8)].reshape(Masker.shape + (Masker.itemsize,)).sum(axis=-1)
+
+def LavHoldMaske(Lande, HoldIndeks):
+    # Samler hold i en maske med én bit pr. hold, ukendte hold og NaN springes over
+    Type = MaskeType(len(HoldIndeks))
+    Maske = Type(0)
+    for land in Lande:
+        if land in HoldIndeks:
+            Maske |= Type(1 << HoldIndeks[land])
+    return Maske
+
+def ErstatFil(Sti, Skriv):
+    # Skriver en fil gennem en midlertidig fil og os.replace, så samtidige læsere aldrig ser en halvt skrevet fil
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(Sti), prefix=os.path.basename(Sti) + '.', suffix='.tmp', delete=False) as f:
+        try:
+            Skriv(f)
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+    os.replace(f.name, Sti)
+
+def CacheSti(Fil, **Argumenter):
+    # Stien til en fils cache uden endelse, nøglen skifter når filens indhold eller argumenterne ændres
+    Mappe = os.path.join(os.path.dirname(os.path.abspath(Fil)), CacheMappe) # Cachen ligger ved siden af filen
+    os.makedirs(Mappe, exist_ok=True)
+    IndeksFil = os.path.join(Mappe, 'indeks.json')
+    try:
+        with open(IndeksFil, encoding='utf-8') as f:
+            Indeks = json.load(f)
+    except (OSError, ValueError): # Et manglende eller ulæseligt indeks bygges op igen
+        Indeks = {}
+
+    Info = os.stat(Fil)
+    IndeksNøgle = f'{os.path.abspath(Fil)}|{sorted(Argumenter.items())!r}'
+    Post = Indeks.get(IndeksNøgle)
+
+    if Post is None or [Post['Ændret'], Post['Størrelse']] != [Info.st_mtime_ns, Info.st_size]: # Hasher kun ændrede filer
+        with open(Fil, 'rb') as f:
+            Indhold = hashlib.sha256(f.read()).hexdigest()
+        Nøgle = hashlib.sha256(f'{Indhold}|{sorted(Argumenter.items())!r}'.encode()).hexdigest()[:32]
+
+        Gammel = Post['Nøgle'] if Post is not None else None
+        Post = {'Ændret': Info.st_mtime_ns, 'Størrelse': Info.st_size, 'Nøgle': Nøgle}
+        Indeks[IndeksNøgle] = Post
+        ErstatFil(IndeksFil, lambda f: f.write(json.dumps(Indeks).encode('utf-8')))
+
+        # Cachen for filens tidligere indhold slettes, medmindre en anden post stadig bruger den
+        if Gammel not in (None, Nøgle) and all(Andet['Nøgle'] != Gammel for Andet in Indeks.values()):
+            for Sti in glob.glob(os.path.join(Mappe, Gammel + '.*')):
+                try:
+                    os.remove(Sti)
+                except OSError:
+                    pass
+
+    return os.path.join(Mappe, Post['Nøgle'])
+
+def LæsExcel(Fil, **Argumenter):
+    # Indlæser en Excel-fil gennem en kolonnebaseret cache, som genopbygges når filen ændres
+    Sti = CacheSti(Fil, **Argumenter)
+    if not os.path.exists(Sti + '.json'):
+        GemArk(Sti, pd.read_excel(Fil, **Argumenter))
+
+    return IndlæsArk(Sti)
+
+def GemArk(Sti, Data):
+    # Gemmer et eller flere ark som ét struktureret array med arkets nummer som første kolonne
+    Ark = Data if isinstance(Data, dict) else {None: Data}
+    Samlet = pd.concat(list(Ark.values()), ignore_index=True)
+
+    Kolonner = {'Ark': np.repeat(np.arange(len(Ark), dtype=np.int32), [len(df) for df in Ark.values()])}
+    for kol in Samlet.columns:
+        if pd.api.types.is_numeric_dtype(Samlet[kol]):
+            Kolonner[str(kol)] = Samlet[kol].to_numpy(dtype=float)
+        else: # Tekst gemmes med fast bredde, så arrayet kan memory-mappes, og tomme celler som ''
+            Kolonner[str(kol)] = Samlet[kol].fillna('').astype(str).to_numpy(dtype=str)
+
+    Array = np.empty(len(Samlet), dtype=[(kol, værdier.dtype) for kol, værdier in Kolonner.items()])
+    for kol, værdier in Kolonner.items():
+        Array[kol] = værdier
+
+    ErstatFil(Sti + '.npy', lambda f: np.save(f, Array))
+
+    Meta = {'Ark': list(Ark) if isinstance(Data, dict) else None, 'Kolonner': list(Kolonner)[1:]}
+    ErstatFil(Sti + '.json', lambda f: f.write(json.dumps(Meta).encode('utf-8'))) # Metadata skrives sidst og markerer en færdig cache
+
+def IndlæsArk(Sti):
+    # Indlæser ark gemt med GemArk via memory-mapping
+    with open(Sti + '.json', encoding='utf-8') as f:
+        Meta = json.load(f)
+    Array = np.load(Sti + '.npy', mmap_mode='r')
+
+    def LavDataFrame(Rækker):
+        df = pd.DataFrame({kol: Rækker[kol] for kol in Meta['Kolonner']})
+        for kol in Meta['Kolonner']:
+            if Rækker.dtype[kol].kind == 'U':
+                df[kol] = df[kol].astype(object).where(df[kol] != '', np.nan)
+        return df
+
+    if Meta['Ark'] is None:
+        return LavDataFrame(Array)
+
+    Grænser = np.searchsorted(Array['Ark'], np.arange(len(Meta['Ark']) + 1))
+    return {ark: LavDataFrame(Array[Grænser[a]:Grænser[a + 1]]) for a, ark in enumerate(Meta['Ark'])}
+
+BoisPrBlok = 10000 # Antal bois der beregnes gruppestillinger for ad gangen
+
+EuroKonfiguration = { # Turneringen, puljen og filerne når intet andet er angivet
+    'Grupper': {
+        'Gruppe A': ['Tyskland', 'Skotland', 'Ungarn', 'Schweiz'],
+        'Gruppe B': ['Spanien', 'Kroatien', 'Italien', 'Albanien'],
+        'Gruppe C': ['Slovenien', 'Danmark', 'Serbien', 'England'],
+        'Gruppe D': ['Polen', 'Holland', 'Østrig', 'Frankrig'],
+        'Gruppe E': ['Belgien', 'Slovakiet', 'Rumænien', 'Ukraine'],
+        'Gruppe F': ['Tyrkiet', 'Georgien', 'Portugal', 'Tjekkiet']
+    },
+
+    'GrupperKort': {
+        'Skotland': {'Gule kort': 5, 'Røde kort': 1},
+        'Belgien': {'Gule kort': 5, 'Røde kort': 0},
+        'England': {'Gule kort': 4, 'Røde kort': 0},
+        'Frankrig': {'Gule kort': 3, 'Røde kort': 0},
+        'Ukraine': {'Gule kort': 3, 'Røde kort': 0},
+        'Holland': {'Gule kort': 2, 'Røde kort': 0},
+        'Slovakiet': {'Gule kort': 2, 'Røde kort': 0},
+        'Rumænien': {'Gule kort': 7, 'Røde kort': 0},
+        'Italien': {'Gule kort': 7, 'Røde kort': 0},
+        'Portugal': {'Gule kort': 7, 'Røde kort': 0},
+        'Albanien': {'Gule kort': 7, 'Røde kort': 0},
+        'Slovenien': {'Gule kort': 7, 'Røde kort': 0},
+        'Danmark': {'Gule kort': 6, 'Røde kort': 0},
+        'Georgien': {'Gule kort': 6, 'Røde kort': 0},
+        'Spanien': {'Gule kort': 5, 'Røde kort': 0},
+        'Tyskland': {'Gule kort': 5, 'Røde kort': 0},
+        'Tyrkiet': {'Gule kort': 16, 'Røde kort': 0},
+        'Tjekkiet': {'Gule kort': 13, 'Røde kort': 2},
+        'Østrig': {'Gule kort': 10, 'Røde kort': 0},
+        'Ungarn': {'Gule kort': 10, 'Røde kort': 0},
+        'Serbien': {'Gule kort': 9, 'Røde kort': 0},
+        'Polen': {'Gule kort': 8, 'Røde kort': 0},
+        'Schweiz': {'Gule kort': 8, 'Røde kort': 0},
+        'Kroatien': {'Gule kort': 7, 'Røde kort': 0}
+    },
+
+    'bois': [
+        'Gustav',
+        'Findsen',
+        'Mads',
+        'Kris',
+        'Jens',
+        'Thomas',
+        'Rasmus'
+    ],
+    'Filer': {
+        'Resultater': 'Resultater.xlsx',
+        'Bud': 'Bud.xlsx',
+        'Slutspil': 'Slutspil.xlsx',
+        'SlutspilBud': 'SlutspilBud.xlsx'
+    },
+    'Point': {'Slutspil': SlutspilRunder, 'Gruppevinder': 5}
+}
+
+def LæsKonfiguration(Kilde=None):
+    # Læser en konfiguration fra en JSON-fil eller et dict og udfylder det der mangler fra EuroKonfiguration
+    if isinstance(Kilde, str):
+        with open(Kilde, encoding='utf-8') as f:
+            Konfiguration = json.load(f)
+        Konfiguration.setdefault('Mappe', '.')
+        Konfiguration['Mappe'] = os.path.join(os.path.dirname(os.path.abspath(Kilde)), Konfiguration['Mappe']) # Relativt til filen
+    else:
+        Konfiguration = dict(Kilde or {})
+
+    Samlet = {**EuroKonfiguration, **Konfiguration}
+    Samlet['Filer'] = {**EuroKonfiguration['Filer'], **Konfiguration.get('Filer', {})}
+    Samlet['Point'] = {**EuroKonfiguration['Point'], **Konfiguration.get('Point', {})}
+    if 'Grupper' in Konfiguration and 'GrupperKort' not in Konfiguration: # Kort for en anden turnering er ukendte
+        Samlet['GrupperKort'] = {}
+    if 'Grupper' in Konfiguration and 'bois' not in Konfiguration:
+        Samlet['bois'] = []
+    if len(Samlet['Point']['Slutspil']) != len(SlutspilRunder):
+        raise ValueError(f"Point for slutspillet skal angives for alle {len(SlutspilRunder)} runder")
+
+    return Samlet
+
+OvervågedeFiler = { # Inputfiler og det importtrin der nulstilles når filen ændres
+    'Resultater': '_ImporterGrupperResultater',
+    'Slutspil': '_ImporterSlutspilResultater',
+    'Bud': '_ImporterBud',
+    'SlutspilBud': '_ImporterSlutspilBud'
+}
+
+ResultatTrin = [ # Trin der kun afhænger af resultaterne og kan deles af flere puljer
+    '_ImporterGrupperResultater',
+    '_BeregnGrupperStilling',
+    '_ImporterSlutspilResultater',
+    '_BestemOttendedelsfinaler',
+    '_BestemSlutspil'
+]
+
+LiveSide = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset='utf-8'>
+<title>TBTF Euro</title>
+</head>
+<body>
+<div id='live'>{html}</div>
+<script>
+new EventSource('/begivenheder').onmessage = e => {{
+    const Opdatering = JSON.parse(e.data);
+    if (Opdatering.Html) document.getElementById('live').innerHTML = Opdatering.Html;
+}};
+</script>
+</body>
+</html>
+"""
+
+# Fælles stylesheet for tabellerne med differencer, som kun skal med én gang pr. side
+DiffStil = """
+<style>
+    .bois-dataframe {
+        font-size: 10px;
+    }
+    .bois-dataframe thead th {
+        text-align: center;
+        font-size: 12px;
+    }
+    .bois-dataframe tbody td {
+        text-align: center;
+    }
+    .bois-dataframe thead th:nth-child(1), .bois-dataframe tbody td:nth-child(1) {
+        width: 150px;
+    }
+    .bois-dataframe thead th:nth-child(2), .bois-dataframe tbody td:nth-child(2) {
+        width: 100px;
+    }
+    .bois-dataframe thead th:nth-child(3), .bois-dataframe tbody td:nth-child(3) {
+        width: 100px;
+    }
+    .bois-dataframe thead th:nth-child(4), .bois-dataframe tbody td:nth-child(4) {
+        width: 100px;
+    }
+    .bois-dataframe thead th:nth-child(5), .bois-dataframe tbody td:nth-child(5) {
+        width: 100px;
+    }
+</style>
+"""
+
+def StilGrupper(StillingGrupper, StillingTredjepladser):
+    # Laver HTML med farvede gruppestillinger og de bedste treere
+    def Formattering(s, tredjepladser):
+        formattering = []
+        for idx in range(len(s)):
+            if s.index[idx] in tredjepladser:
+                formattering.append('background-color: rgba(0, 209, 0, 0.12)') 
+            elif idx < 1:
+                formattering.append('background-color: rgba(0, 209, 0, 0.5)') 
+            elif 0 < idx < 2:
+                formattering.append('background-color: rgba(0, 209, 0, 0.25)') 
+            else:
+                formattering.append('')
+        return formattering
+
+    tredjepladser = StillingTredjepladser.index[:4].tolist()
+
+    html = "<div style='display: grid; grid-template-columns: repeat(3, 1fr); gap: 15px;'>"
+    for gruppe, df in StillingGrupper.items():
+        formateret_df = df.style.apply(Formattering, axis=0, tredjepladser=tredjepladser).set_table_attributes('style="display:inline;margin:5px;"').set_caption(gruppe)
+        html += formateret_df._repr_html_()
+    html += "</div>"
+
+    html += "<div style='text-align:center; margin-top: 20px;'>"
+    formateret_tredjeplads_df = StillingTredjepladser.style.apply(Formattering, axis=0, tredjepladser=tredjepladser).set_table_attributes('style="display:inline;margin:5px;"').set_caption('Bedste 3\'ere')
+    html += formateret_tredjeplads_df._repr_html_()
+    html += "</div>"
+
+    return html
+
+XlsxNavnerum = { # Navnerum i xlsx-filernes XML
+    'Ark': '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}',
+    'Relationer': '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+}
+
+def FindXlsxArk(Zip):
+    # Finder arkenes navne og stier i en åben xlsx-fil i arkenes rækkefølge
+    Bog = ET.fromstring(Zip.read('xl/workbook.xml'))
+    Relationer = {r.get('Id'): r.get('Target') for r in ET.fromstring(Zip.read('xl/_rels/workbook.xml.rels'))}
+
+    Ark = []
+    for ark in Bog.iter(XlsxNavnerum['Ark'] + 'sheet'):
+        Mål = Relationer[ark.get(XlsxNavnerum['Relationer'] + 'id')]
+        Ark.append((ark.get('name'), Mål.lstrip('/') if Mål.startswith('/') else 'xl/' + Mål)) # Stien er absolut eller relativ til xl/
+    return Ark
+
+def LæsDelteStrenge(Zip):
+    # Læser de delte strenge i en åben xlsx-fil, fx holdnavne, som cellerne henviser til med nummer
+    if 'xl/sharedStrings.xml' not in Zip.namelist():
+        return []
+    return [''.join(si.itertext()) for si in ET.fromstring(Zip.read('xl/sharedStrings.xml')).iter(XlsxNavnerum['Ark'] + 'si')]
+
+def KolonneNummer(Reference):
+    # Kolonnen i en cellereference som C12 eller AA3, talt fra 0
+    Nummer = 0
+    for Bogstav in Reference.rstrip('0123456789'):
+        Nummer = 26 * Nummer + ord(Bogstav) - ord('A') + 1
+    return Nummer - 1
+
+def XlsxRækkeElementer(Zip, Sti, StrømGrænse=2**24):
+    # Rækkerne i et ark som XML-elementer, store ark læses løbende med iterparse så de ikke holdes i hukommelsen
+    N = XlsxNavnerum['Ark']
+    if Zip.getinfo(Sti).file_size < StrømGrænse: # Små ark er hurtigst at parse på én gang
+        yield from ET.fromstring(Zip.read(Sti)).iter(N + 'row')
+        return
+
+    with Zip.open(Sti) as f:
+        for Begivenhed, Element in ET.iterparse(f, events=('start', 'end')):
+            if Begivenhed == 'start' and Element.tag == N + 'sheetData':
+                Rækker = Element
+            elif Begivenhed == 'end' and Element.tag == N + 'row':
+                yield Element
+                Rækker.clear() # Læste rækker smides væk
+
+def LæsXlsxRækker(Zip, Sti, Strenge, AntalKolonner):
+    # Læser værdierne i de første AntalKolonner kolonner for hver række i et ark, tomme celler er None
+    N = XlsxNavnerum['Ark']
+    for Række in XlsxRækkeElementer(Zip, Sti):
+        Celler = [None] * AntalKolonner
+        for i, Celle in enumerate(Række):
+            Reference = Celle.get('r') # Mangler referencen er cellerne i rækkefølge
+            Kolonne = i if Reference is None else KolonneNummer(Reference)
+            if Kolonne >= AntalKolonner:
+                continue
+            Type = Celle.get('t')
+            if Type == 'inlineStr':
+                Celler[Kolonne] = ''.join(Celle.itertext())
+            else:
+                v = Celle.find(N + 'v')
+                if v is not None:
+                    Celler[Kolonne] = Strenge[int(v.text)] if Type == 's' else v.text
+        yield Celler
+
+def LæsBudStrøm(Kilde, ChunkStørrelse=100000):
+    # Læser bud i bidder fra en mappe med én CSV/XLSX-fil pr. boi eller fra én lang fil med kolonnerne Boi, Hold 1, Hold 2, Mål 1, Mål 2
+    # Filerne læses række for række uden cache, og bidderne har højst ChunkStørrelse rækker
+    Kolonner = ['Boi', 'Hold 1', 'Hold 2', 'Mål 1', 'Mål 2']
+
+    def LavBid(Rækker, Navne):
+        Bid = pd.DataFrame(Rækker, columns=Navne).replace('', np.nan) # Tomme celler er manglende som i read_excel
+        Bid[['Mål 1', 'Mål 2']] = Bid[['Mål 1', 'Mål 2']].apply(pd.to_numeric, errors='coerce')
+        return Bid
+
+    if os.path.isdir(Kilde): # Filens navn er boiens navn, og små filer samles i samme bid
+        Rækker = []
+        for Fil in sorted(os.listdir(Kilde)):
+            Boi, Endelse = os.path.splitext(Fil)
+            Sti = os.path.join(Kilde, Fil)
+            if Endelse == '.csv':
+                with open(Sti, newline='', encoding='utf-8') as f:
+                    Rækker.extend([Boi] + (Række + [None] * 4)[:4] for Række in csv.reader(f))
+            elif Endelse == '.xlsx':
+                with zipfile.ZipFile(Sti) as Zip:
+                    Rækker.extend([Boi] + Række for Række in LæsXlsxRækker(Zip, FindXlsxArk(Zip)[0][1], LæsDelteStrenge(Zip), 4))
+            if len(Rækker) >= ChunkStørrelse:
+                yield LavBid(Rækker, Kolonner)
+                Rækker = []
+        if Rækker:
+            yield LavBid(Rækker, Kolonner)
+
+    elif Kilde.endswith('.csv'):
+        yield from pd.read_csv(Kilde, chunksize=ChunkStørrelse)
+
+    else: # Første ark i en lang xlsx-fil, hvor første række er kolonnernes navne
+        with zipfile.ZipFile(Kilde) as Zip:
+            Rækker = LæsXlsxRækker(Zip, FindXlsxArk(Zip)[0][1], LæsDelteStrenge(Zip), len(Kolonner))
+            Navne = next(Rækker, Kolonner)
+            Bid = []
+            for Række in Rækker:
+                Bid.append(Række)
+                if len(Bid) >= ChunkStørrelse:
+                    yield LavBid(Bid, Navne)
+                    Bid = []
+            if Bid:
+                yield LavBid(Bid, Navne)
+
+def LæsBudArkDel(Fil, Ark, HoldIndeks):
+    # Læser nogle af arkene i en bud-fil direkte fra XML'en uden openpyxl's celleobjekter, kører i en separat proces ved store filer
+    with zipfile.ZipFile(Fil) as Zip:
+        Strenge = LæsDelteStrenge(Zip)
+
+        Antal = np.zeros(len(Ark), dtype=int)
+        Bud = []
+        for a, Sti in enumerate(Ark):
+            Værdier = []
+            for Celler in LæsXlsxRækker(Zip, Sti, Strenge, 4):
+                if None in Celler or '' in Celler: # Som dropna, tomme og ufuldstændige rækker springes over
+                    continue
+                Værdier.append((HoldIndeks.get(Celler[0], -1), HoldIndeks.get(Celler[1], -1), int(float(Celler[2])), int(float(Celler[3]))))
+
+            Antal[a] = len(Værdier)
+            Bud.append(np.array(Værdier, dtype=np.int8).reshape(-1, 4))
+
+    return Antal, Bud
+
+def LæsBudArk(Fil, HoldIndeks, AntalProcesser=None, ArkPrDel=250):
+    # Læser en bud-fil med ét ark pr. boi direkte til int8-arrays af formen (bois, kampe, 2) uden DataFrames
+    # Arkene deles mellem processer i store filer, og resultatet gemmes i samme cache som LæsExcel
+    Sti = CacheSti(Fil, Læser='LæsBudArk', HoldIndeks=sorted(HoldIndeks.items()))
+    if os.path.exists(Sti + '.npz'):
+        with np.load(Sti + '.npz') as Data:
+            return [str(boi) for boi in Data['Bois']], Data['Antal'], Data['Hold'], Data['Mål']
+
+    with zipfile.ZipFile(Fil) as Zip:
+        Ark = FindXlsxArk(Zip)
+    Bois, Stier = [navn for navn, _ in Ark], [Sti for _, Sti in Ark]
+
+    Dele = [Stier[start:start + ArkPrDel] for start in range(0, len(Stier), ArkPrDel)]
+    if AntalProcesser == 1 or len(Dele) <= 1:
+        Resultater = list(map(LæsBudArkDel, repeat(Fil), Dele, repeat(HoldIndeks)))
+    else:
+        with ProcessPoolExecutor(AntalProcesser) as pulje:
+            Resultater = list(pulje.map(LæsBudArkDel, repeat(Fil), Dele, repeat(HoldIndeks)))
+
+    # Samler buddene, manglende bud udfyldes med -1
+    Antal = np.concatenate([Antal for Antal, _ in Resultater]) if Resultater else np.zeros(0, dtype=int)
+    Rækker = np.full((len(Bois), Antal.max(initial=0), 4), -1, dtype=np.int8)
+    for b, Bud in enumerate(Bud for _, Del in Resultater for Bud in Del):
+        Rækker[b, :len(Bud)] = Bud
+    Hold, Mål = Rækker[..., :2].copy(), Rækker[..., 2:].copy()
+
+    ErstatFil(Sti + '.npz', lambda f: np.savez(f, Bois=np.array(Bois, dtype=str), Antal=Antal, Hold=Hold, Mål=Mål))
+
+    return Bois, Antal, Hold, Mål
+
+def KoderKampe(df, HoldIndeks):
+    # Koder kampe som heltalsarrays med hold-id'er og mål, ukendte hold får id -1
+    Hold = np.stack([
+        df['Hold 1'].map(HoldIndeks).fillna(-1).to_numpy(dtype=int),
+        df['Hold 2'].map(HoldIndeks).fillna(-1).to_numpy(dtype=int)
+    ], axis=-1)
+    Mål = df[['Mål 1', 'Mål 2']].to_numpy(dtype=int)
+
+    return Hold, Mål
+
+def FindKampe(Hold, KampOpslag, Kampe):
+    # Slår kampe op i indekset over (Hold 1, Hold 2) uanset holdenes rækkefølge og angiver om kampen er vendt
+    Kendt = (Hold >= 0).all(axis=-1)
+    Kamp = np.where(Kendt, KampOpslag[Hold[..., 0], Hold[..., 1]], -1) # Ukendte kampe får nummer -1
+    Vendt = Hold[..., 0] != Kampe[Kamp, 0]
+
+    return Kamp, Vendt
+
+def BeregnKampPoint(bMål, Mål):
+    # Beregner point for bud mod resultater, sidste akse er (Mål 1, Mål 2) og øvrige akser broadcastes
+    bUdfald = np.sign(bMål[..., 0] - bMål[..., 1]) # Definerer vinder i bud og kamp
+    Udfald = np.sign(Mål[..., 0] - Mål[..., 1])
+
+    SammeMål = bMål == Mål
+    ÉnMålscore = SammeMål[..., 0] | SammeMål[..., 1]
+    BeggeMålscorer = SammeMål[..., 0] & SammeMål[..., 1]
+
+    return 3 * (bUdfald == Udfald) + ÉnMålscore + 3 * BeggeMålscorer # Regel 1-4 giver 7, 4, 3 og 1 point
+
+def BeregnTabel(Hold, Mål, AntalHold):
+    # Summerer point, mål for og mål imod pr. hold, Hold og Mål har formen (..., kampe, 2) og Hold kan broadcastes
+    Hold = np.broadcast_to(Hold, Mål.shape)
+    Batch = Mål.shape[:-2]
+    AntalBatch = int(np.prod(Batch))
+
+    MålFor = Mål
+    MålImod = Mål[..., ::-1]
+    Point = 3 * (MålFor > MålImod) + (MålFor == MålImod)
+
+    Gyldig = Hold >= 0 # Springer udfyldte og ukendte hold over
+    Indeks = np.arange(AntalBatch).reshape(Batch + (1, 1)) * AntalHold + np.where(Gyldig, Hold, 0)
+
+    Tabel = np.stack([
+        np.bincount(Indeks.ravel(), weights=(Værdi * Gyldig).ravel(), minlength=AntalBatch * AntalHold)
+        for Værdi in (Point, MålFor, MålImod)
+    ], axis=-1)
+
+    return Tabel.reshape(Batch + (AntalHold, 3)).astype(int)
+
+def Rangorden(Tabel, Kort):
+    # Sorterer stabilt langs næstsidste akse efter point, målforskel og mål for (faldende) samt kort (stigende)
+    Point, MålFor, MålImod = Tabel[..., 0], Tabel[..., 1], Tabel[..., 2]
+    return np.lexsort((np.broadcast_to(Kort, Point.shape), -MålFor, MålImod - MålFor, -Point), axis=-1)
+
+def RangerGrupper(Tabel, GruppeHold, Kort):
+    # Rangerer hold i grupperne og grupperne tredjepladser, Tabel har formen (..., hold, 3)
+    GruppeTabel = Tabel[..., GruppeHold, :] # Formen (..., grupper, hold i gruppe, 3)
+    Rækkefølge = Rangorden(GruppeTabel, Kort[GruppeHold])
+    Placeringer = np.take_along_axis(np.broadcast_to(GruppeHold, Rækkefølge.shape), Rækkefølge, axis=-1)
+
+    Treere = Placeringer[..., 2] # Formen (..., grupper)
+    TreerTabel = np.take_along_axis(Tabel, Treere[..., None], axis=-2)
+    Tredjepladser = np.take_along_axis(Treere, Rangorden(TreerTabel, Kort[Treere]), axis=-1)
+
+    return Placeringer, Tredjepladser
+
+# Hvilke grupper de fire bedste treere kommer fra bestemmer hvem gruppevinderne fra B, C, E og F møder.
+# Tabellen slås op med en 6-bit maske over grupperne A-F, hvor de 15 mulige kombinationer er udfyldt
+TredjepladsTabel = np.full((64, 4), -1, dtype=np.int8)
+for Treere, Modstandere in {
+    'ABCD': 'ADBC', 'ABCE': 'AEBC', 'ABCF': 'AFBC', 'ABDE': 'DEAB', 'ABDF': 'DFAB',
+    'ABEF': 'EFBA', 'ACDE': 'EDCA', 'ACDF': 'FDCA', 'ACEF': 'EFCA', 'ADEF': 'EFDA',
+    'BCDE': 'EDBC', 'BCDF': 'FDCB', 'BCEF': 'FECB', 'BDEF': 'FEDB', 'CDEF': 'FEDC'
+}.items():
+    TredjepladsTabel[sum(1 << 'ABCDEF'.index(g) for g in Treere)] = ['ABCDEF'.index(g) for g in Modstandere]
+
+# Ottendedelsfinalerne i samme rækkefølge som Slutspil.xlsx, så vinderne af kamp 2k og 2k+1 mødes i næste runde.
+# Pladserne peger ind i [gruppevindere A-F, toere A-F, treere mod 1B, 1C, 1E og 1F]
+OttendedelsfinaleProgram = np.array([[1, 12], [0, 8], [5, 15], [9, 10], [4, 14], [3, 11], [2, 13], [6, 7]])
+
+def BestemOttendedelsfinaler(Placeringer, Tredjepladser):
+    # Udleder ottendedelsfinalerne af gruppestillingen, Placeringer har formen (..., grupper, 4) og resultatet (..., 8, 2)
+    if Placeringer.shape[-2] != 6: # Tabellen over treere og programmet gælder kun EM-formatet
+        raise ValueError(f"Slutspillets program kan kun udledes for 6 grupper som ved EM, ikke {Placeringer.shape[-2]}")
+    Treere = Placeringer[..., 2]
+    Videre = (Treere[..., None] == Tredjepladser[..., None, :4]).any(axis=-1)
+    Maske = (Videre << np.arange(Videre.shape[-1])).sum(axis=-1)
+
+    Modstandere = np.take_along_axis(Treere, TredjepladsTabel[Maske].astype(int), axis=-1)
+    Pladser = np.concatenate([Placeringer[..., 0], Placeringer[..., 1], Modstandere], axis=-1)
+
+    return Pladser[..., OttendedelsfinaleProgram]
+
+def AfviklSlutspil(Par, AfgørKampe, AntalHold, SlutspilVindere):
+    # Afvikler slutspillet som i _BestemSlutspil og markerer hvilke hold der når hver runde, Par har formen (N, 8, 2)
+    N = len(Par)
+    Runder = np.zeros((N, len(SlutspilRunder), AntalHold), dtype=np.float32)
+    Turneringer = np.arange(N)[:, None]
+    Runder[Turneringer, 0, Par.reshape(N, -1)] = 1
+
+    Kamp = 0
+    for Runde in range(1, len(SlutspilRunder)):
+        Vindere = AfgørKampe(Par, Kamp)
+        Kendte = SlutspilVindere[Kamp:Kamp + Par.shape[1]] # Spillede kampe ligger fast
+        Vindere = np.where(Kendte >= 0, Kendte, Vindere)
+        Kamp += Par.shape[1]
+
+        Runder[Turneringer, Runde, Vindere] = 1
+        if Runde < len(SlutspilRunder) - 1: # Vinderne af kamp 2k og 2k+1 mødes i næste runde
+            Par = Vindere.reshape(N, -1, 2)
+
+    return Runder
+
+def SlutspilVinder(Kamp):
+    # Vinderen af en slutspilskamp efter ordinær tid, forlænget spilletid og straffe, NaN hvis kampen ikke er afgjort
+    Mål1, Mål2 = [
+        sum(Kamp[kol] for kol in [f'Mål {i}', f'Forlænget {i}', f'Straffe {i}'] if not pd.isna(Kamp[kol]))
+        for i in (1, 2)
+    ]
+
+    if Mål1 > Mål2:
+        return Kamp['Hold 1']
+    elif Mål1 < Mål2:
+        return Kamp['Hold 2']
+    return np.nan
+
+def PlacerSlutspilKampe(Kampe, Ottendedelsfinaler):
+    # Finder hver slutspilskamps plads i programmet som i AfviklSlutspil: 0-7 er ottendedelsfinalerne, og vinderne fra
+    # plads p mødes på plads 8 + p // 2. Returnerer pladserne og vinderen på hver af de 15 pladser, NaN hvis den ikke kendes
+    # En kamp der ikke står i programmet placeres efter sin række i arket som i de oprindelige rækker, og kan den
+    # plads ikke bruges springes kampen over med en advarsel og får pladsen None
+    Program = [set(Par) for Par in Ottendedelsfinaler] + [None] * (15 - len(Ottendedelsfinaler))
+    Vindere = [np.nan] * 15
+    Pladser = []
+
+    for Række, Kamp in enumerate(Kampe):
+        Hold = {Kamp['Hold 1'], Kamp['Hold 2']}
+        Plads = next((p for p, Par in enumerate(Program) if Par == Hold and p not in Pladser), None)
+        if Plads is None and Række < 15 and Program[Række] is None and Række not in Pladser:
+            if Ottendedelsfinaler: # Før programmet er udledt er rækkefølgen i arket det eneste der er at gå efter
+                warnings.warn(f"{Kamp['Hold 1']} - {Kamp['Hold 2']} er ikke en kamp i slutspillets program, placeres efter rækken i arket")
+            Plads = Række
+            Program[Plads] = Hold
+        elif Plads is None:
+            warnings.warn(f"{Kamp['Hold 1']} - {Kamp['Hold 2']} er ikke en kamp i slutspillets program og springes over")
+            Pladser.append(None)
+            continue
+        Pladser.append(Plads)
+        Vindere[Plads] = SlutspilVinder(Kamp)
+
+        if Plads < 14: # Kampen i næste runde kendes når begge kampe før den er afgjort
+            Næste = 8 + Plads // 2
+            Par = Vindere[2 * Næste - 16], Vindere[2 * Næste - 15]
+            if not any(pd.isna(Hold) for Hold in Par):
+                Program[Næste] = set(Par)
+
+    return Pladser, Vindere
+
+def BeregnSlutspilPoint(Runder, bRunder, Vægte):
+    # Beregner slutspilspoint af formen (N, bois) ud fra hvilke hold der når hver runde, bois' bud på runderne og point pr. runde
+    Vægte = np.asarray(Vægte, dtype=np.float32)[:, None]
+    return ((Runder * Vægte).reshape(len(Runder), -1) @ bRunder.reshape(len(bRunder), -1).T).astype(int)
+
+def AntalOver(Værdier, Grænser):
+    # Tæller i hver række hvor mange værdier der er større end hver grænse, Værdier har formen (N, bois) og Grænser (N, antal)
+    # Begge er ikke-negative, og Grænser kan være et udsnit af bois
+    N, AntalBois = Værdier.shape
+    Rækker = np.arange(N)[:, None]
+    Forskydning = Rækker * (max(Værdier.max(initial=0), Grænser.max(initial=0)) + 1)
+
+    Sorteret = (np.sort(Værdier, axis=1) + Forskydning).ravel()
+    HøjstLige = np.searchsorted(Sorteret, (Grænser + Forskydning).ravel(), side='right').reshape(Grænser.shape) - Rækker * AntalBois
+
+    return AntalBois - HøjstLige
+
+def SimulerSlutspilKampe(Hold, Model, rng):
+    # Simulerer slutspilskampe med ordinær tid, forlænget spilletid og straffe, Hold har formen (..., 2)
+    λ = Model['μ'] * Model['Angreb'][Hold] * Model['Forsvar'][Hold[..., ::-1]]
+
+    Mål = stats.poisson.rvs(λ, random_state=rng)
+    Uafgjort = Mål[..., 0] == Mål[..., 1]
+    Mål = Mål + Uafgjort[..., None] * stats.poisson.rvs(λ / 3, random_state=rng) # Forlænget spilletid
+
+    Uafgjort = Mål[..., 0] == Mål[..., 1]
+    Hold1Vinder = (Mål[..., 0] > Mål[..., 1]) | (Uafgjort & (rng.random(Uafgjort.shape) < 0.5)) # Straffe
+
+    return np.where(Hold1Vinder, Hold[..., 0], Hold[..., 1])
+
+def SimulerTurneringer(Model, AntalTurneringer, Frø):
+    # Simulerer en batch af turneringer og tæller hvor ofte hver boi ender på hver placering
+    rng = np.random.default_rng(Frø)
+    N = AntalTurneringer
+    AntalHold = len(Model['Angreb'])
+    AntalBois = len(Model['FastePoint'])
+
+    # Gruppespil
+    RestHold = Model['RestHold']
+    λ = Model['μ'] * Model['Angreb'][RestHold] * Model['Forsvar'][RestHold[:, ::-1]]
+    Mål = stats.poisson.rvs(λ, size=(N,) + λ.shape, random_state=rng) # Formen (turneringer, kampe, 2)
+
+    if len(RestHold): # Et afsluttet gruppespil skal ikke rangeres igen
+        Tabel = Model['StillingTabel'] + BeregnTabel(RestHold, Mål, AntalHold)
+        Placeringer, Tredjepladser = RangerGrupper(Tabel, Model['GruppeHold'], Model['Kort'])
+    else:
+        Placeringer = np.broadcast_to(Model['Placeringer'], (N,) + Model['Placeringer'].shape)
+        Tredjepladser = np.broadcast_to(Model['Tredjepladser'], (N,) + Model['Tredjepladser'].shape)
+
+    Point = Model['FastePoint'] + (BeregnKampPoint(Model['bRestMål'], Mål[:, None]) * Model['bRestGyldig']).sum(axis=-1)
+    Point += Model['Bonus'] * (Model['bVindere'] == Placeringer[:, None, :, 0]).sum(axis=-1)
+
+    # Slutspil
+    if Model['Ottendedelsfinaler'] is None: # Uden kendt program udledes det af hver turnerings gruppestilling
+        Par = BestemOttendedelsfinaler(Placeringer, Tredjepladser)
+    else:
+        Par = np.broadcast_to(Model['Ottendedelsfinaler'], (N,) + Model['Ottendedelsfinaler'].shape)
+    Runder = AfviklSlutspil(Par, lambda Par, Kamp: SimulerSlutspilKampe(Par, Model, rng), AntalHold, Model['SlutspilVindere'])
+
+    Point += BeregnSlutspilPoint(Runder, Model['bRunder'], Model['SlutspilVægte'])
+
+    Placering = AntalOver(Point, Point) # Antallet af bois med flere point, så lige point deler placering
+
+    return np.bincount(
+        (np.arange(AntalBois) * AntalBois + Placering).ravel(), minlength=AntalBois * AntalBois
+    ).reshape(AntalBois, AntalBois)
+
+def ScenarieGitter(AntalKampe, MaksMål=5, MaksScenarier=2**20):
+    # Opregner alle kombinationer af resultater fra 0-0 til MaksMål-MaksMål i et antal kampe, formen (scenarier, kampe, 2)
+    if (MaksMål + 1) ** (2 * AntalKampe) > MaksScenarier: # Gitteret vokser eksponentielt med antallet af kampe
+        raise ValueError(
+            f"{AntalKampe} kampe med op til {MaksMål} mål giver {(MaksMål + 1) ** (2 * AntalKampe)} scenarier, over grænsen på "
+            f"{MaksScenarier}. Brug et lavere MaksMål eller simulér med _SimulerTurnering"
+        )
+    Scorer = np.stack(np.meshgrid(np.arange(MaksMål + 1), np.arange(MaksMål + 1), indexing='ij'), axis=-1).reshape(-1, 2)
+    Kombinationer = np.stack(np.meshgrid(*[np.arange(len(Scorer))] * AntalKampe, indexing='ij'), axis=-1).reshape(-1, AntalKampe)
+    return Scorer[Kombinationer]
+
+def LavGruppeUdfald(Model, g, MaksMål):
+    # Opregner alle resultater op til MaksMål i en gruppes resterende kampe og samler de forskellige udfald for bois
+    AntalBois = len(Model['FastePoint'])
+    Gruppe = Model['GruppeHold'][g]
+    IGruppe = np.isin(Model['RestHold'][:, 0], Gruppe)
+    RestHold = Model['RestHold'][IGruppe]
+
+    Mål = ScenarieGitter(len(RestHold), MaksMål) # Formen (udfald, kampe, 2)
+
+    # Gruppestillingen beregnes én gang pr. udfald og genbruges i alle grene af søgningen
+    Tabel = Model['StillingTabel'] + BeregnTabel(RestHold, Mål, len(Model['Kort']))
+    Placering = Gruppe[Rangorden(Tabel[:, Gruppe], Model['Kort'][Gruppe])]
+    TreerTabel = Tabel[np.arange(len(Mål)), Placering[:, 2]]
+
+    Point = (BeregnKampPoint(Model['bRestMål'][:, IGruppe], Mål[:, None]) * Model['bRestGyldig'][:, IGruppe]).sum(axis=-1)
+    Point += Model['Bonus'] * (Model['bVindere'][:, g] == Placering[:, :1])
+
+    Udfald = np.unique(np.column_stack([Point, Placering[:, :3], TreerTabel]), axis=0) # Kun udfald der gør en forskel
+    return {'Gruppe': g, 'Point': Udfald[:, :AntalBois], 'Placering': Udfald[:, AntalBois:AntalBois + 3], 'TreerTabel': Udfald[:, AntalBois + 3:]}
+
+def SlutspilUdfald(Model, Ottendedelsfinaler):
+    # Opregner alle veje gennem et programs uafgjorte kampe og samler de forskellige point for bois, formen (veje, bois)
+    Ukendte = np.flatnonzero(Model['SlutspilVindere'] < 0)
+    Hold1Vinder = np.zeros((2 ** len(Ukendte), len(Model['SlutspilVindere'])), dtype=bool)
+    Hold1Vinder[:, Ukendte] = (np.arange(2 ** len(Ukendte))[:, None] >> np.arange(len(Ukendte))) & 1
+
+    Par = np.broadcast_to(Ottendedelsfinaler, (len(Hold1Vinder),) + Ottendedelsfinaler.shape)
+    Runder = AfviklSlutspil(
+        Par,
+        lambda Par, Kamp: np.where(Hold1Vinder[:, Kamp:Kamp + Par.shape[1]], Par[..., 0], Par[..., 1]),
+        len(Model['Kort']),
+        Model['SlutspilVindere']
+    )
+
+    return np.unique(BeregnSlutspilPoint(Runder, Model['bRunder'], Model['SlutspilVægte']), axis=0)
+
+def LavSlutspilUdfald(Model):
+    # Slutspillet som en blok af udfald når programmet er kendt
+    return {'Gruppe': None, 'Point': SlutspilUdfald(Model, Model['Ottendedelsfinaler'])}
+
+def UdledProgrammer(Model, Blokke, Valg):
+    # Udleder ottendedelsfinalerne af de valgte gruppeudfald, formen (programmer, 16), og hvilket program hvert udfald giver
+    N = len(Valg[-1])
+    Top = np.repeat(Model['Placeringer'][None, :, :3], N, axis=0)
+    TreerTabel = np.repeat(Model['StillingTabel'][Model['Placeringer'][:, 2]][None], N, axis=0)
+
+    for Blok, o in zip(Blokke, Valg):
+        if Blok['Gruppe'] is not None:
+            Top[:, Blok['Gruppe']] = Blok['Placering'][o]
+            TreerTabel[:, Blok['Gruppe']] = Blok['TreerTabel'][o]
+
+    Treere = Top[:, :, 2]
+    Tredjepladser = np.take_along_axis(Treere, Rangorden(TreerTabel, Model['Kort'][Treere]), axis=1)
+    Pladser, Program = np.unique(BestemOttendedelsfinaler(Top, Tredjepladser).reshape(N, -1), axis=0, return_inverse=True)
+
+    return Pladser, Program.ravel() # Mange udfald giver samme program, som så kun gennemregnes én gang
+
+def SlutspilPladsPoint(Model, Pladser):
+    # Point hvis holdet på hver plads når hver runde, formen (programmer, bois, runder, pladser)
+    Vægte = np.asarray(Model['SlutspilVægte'])[:, None]
+    return (Model['bRunder'][:, :, Pladser] * Vægte[..., None]).transpose(2, 0, 1, 3).astype(int)
+
+def BedsteVej(PladsPoint):
+    # Højeste sum af PladsPoint gennem programmet, hvor holdet på en plads vinder sin del af programmet
+    # PladsPoint har formen (..., runder, pladser) og resultatet formen (...)
+    Værdi = PladsPoint[..., 0, :]
+    for Runde in range(1, PladsPoint.shape[-2]):
+        Halvdele = 2 ** (Runde - 1)
+        Modstander = Værdi.reshape(Værdi.shape[:-1] + (-1, 2, Halvdele)).max(axis=-1)[..., ::-1, None] # Den anden halvdels bedste
+        Værdi = Værdi + Modstander.repeat(Halvdele, axis=-1).reshape(Værdi.shape) + PladsPoint[..., Runde, :]
+
+    return Værdi.max(axis=-1)
+
+def SlutspilInterval(Model, Pladser):
+    # Begrænser hver boi hver for sig til værste og bedste vej gennem hvert program, formen (programmer, bois)
+    PladsPoint = SlutspilPladsPoint(Model, Pladser)
+    return -BedsteVej(-PladsPoint), BedsteVej(PladsPoint)
+
+def ParvisMaks(Point, Grænse=2**24):
+    # Hvor meget hver boi højst kan tage ind på hver anden boi i et af udfaldene, Point har formen (udfald, bois) og resultatet (bois, bois)
+    Del = max(1, Grænse // Point.shape[1] ** 2)
+    return np.max([(Point[i:i + Del, :, None] - Point[i:i + Del, None]).max(axis=0) for i in range(0, len(Point), Del)], axis=0)
+
+def SlutspilParvisMaks(Model, Grænse=2**24):
+    # Hvor meget hver boi højst kan tage ind på hver anden boi i slutspillet uanset program, formen (bois, bois)
+    # Hver runde giver højst forskellen på de hold der tæller mest, med lige så mange hold som når runden
+    Værdi = Model['bRunder'] * np.asarray(Model['SlutspilVægte'], dtype=np.float32)[:, None] # Formen (bois, runder, hold)
+    Del = max(1, Grænse // Værdi.size)
+    Maks = []
+    for i in range(0, len(Værdi), Del):
+        Forskel = -np.sort(Værdi[None] - Værdi[i:i + Del, None], axis=-1) # Faldende, formen (del, bois, runder, hold)
+        Maks.append(sum(Forskel[..., Runde, :16 >> Runde].sum(axis=-1) for Runde in range(Værdi.shape[1])))
+    return np.concatenate(Maks).astype(int)
+
+def ParvisPlaceringer(Point, Indhent, Udbyg, Åbne, Grænse=2**16):
+    # Grænser for de åbne bois' placering ud fra hvor meget hver boi højst kan indhente og udbygge mod hver åben boi
+    # Point har formen (N, bois) og Indhent og Udbyg formen (bois, åbne)
+    Del = max(1, Grænse // Indhent.size)
+    Forspring = [Point[i:i + Del, :, None] - Point[i:i + Del, None, Åbne] for i in range(0, len(Point), Del)]
+    return (
+        np.concatenate([(F > Udbyg).sum(axis=1) for F in Forspring]), # Bois der er foran uanset resten
+        np.concatenate([(F + Indhent > 0).sum(axis=1) for F in Forspring]) # Bois der kan komme foran
+    )
+
+def VurderUdfald(Model, Blokke, Valg, Åbne, Bedste, Værste, Eksakt=True, Grænse=2**16):
+    # Bedste og værste placering for de åbne bois i fulde udfald, Valg har et array af udfald for hver blok
+    # Uden kendt program begrænses slutspillet først for hver boi og hvert par af bois for sig, og udfald der stadig
+    # kan flytte en placering ud over Bedste og Værste regnes eksakt med alle veje gennem programmet, så længe
+    # Model['SlutspilBudget'] rækker. Bedste og Værste opdateres kun med eksakte placeringer, de øvrige udfald får
+    # grænser, og uden Eksakt gives kun grænserne
+    Point = Model['FastePoint'] + sum(Blok['Point'][o] for Blok, o in zip(Blokke, Valg))
+    Åbne = np.arange(Point.shape[1])[Åbne]
+    if Model['Ottendedelsfinaler'] is not None:
+        Op = Ned = AntalOver(Point, Point[:, Åbne])
+        Bedste[Åbne] = np.minimum(Bedste[Åbne], Op.min(axis=0))
+        Værste[Åbne] = np.maximum(Værste[Åbne], Ned.max(axis=0))
+        return Op, Ned
+
+    Pladser, Program = UdledProgrammer(Model, Blokke, Valg)
+    SlutspilLo, SlutspilHi = SlutspilInterval(Model, Pladser)
+    Lo, Hi = Point + SlutspilLo[Program], Point + SlutspilHi[Program]
+    Op, Ned = AntalOver(Lo, Hi[:, Åbne]), AntalOver(Hi, Lo[:, Åbne]) - (Hi[:, Åbne] > Lo[:, Åbne])
+
+    # De mest lovende udfald regnes først, så Bedste og Værste strammes og de følgende kan springes over
+    Håb = np.maximum(Bedste[Åbne] - Op, Ned - Værste[Åbne]).max(axis=1)
+    Tvivl = np.flatnonzero(Håb > 0)
+    Tvivl = Tvivl[np.argsort(-Håb[Tvivl], kind='stable')]
+    Cache = Model.setdefault('SlutspilCache', {}) # Programmernes veje genbruges på tværs af kald
+    for p in pd.unique(Program[Tvivl]):
+        # Hvor meget hver boi højst kan indhente og udbygge mod hver åben boi gennem programmet, formen (bois, åbne)
+        PladsPoint = SlutspilPladsPoint(Model, Pladser[p:p + 1])[0]
+        Del = max(1, Grænse // (len(Åbne) * PladsPoint[0].size))
+        Indhent, Udbyg = [np.concatenate([
+            BedsteVej(Fortegn * (PladsPoint[i:i + Del, None] - PladsPoint[None, Åbne])) for i in range(0, len(PladsPoint), Del)
+        ]) for Fortegn in (1, -1)]
+
+        Rækker = Tvivl[Program[Tvivl] == p]
+        ParvisOp, ParvisNed = ParvisPlaceringer(Point[Rækker], Indhent, Udbyg, Åbne, Grænse)
+        Op[Rækker], Ned[Rækker] = np.maximum(Op[Rækker], ParvisOp), np.minimum(Ned[Rækker], ParvisNed)
+
+        Rækker = Rækker[((Op[Rækker] < Bedste[Åbne]) | (Ned[Rækker] > Værste[Åbne])).any(axis=1)]
+        if not Eksakt or not len(Rækker):
+            continue
+
+        Nøgle = Pladser[p].tobytes()
+        if Nøgle not in Cache:
+            Veje = SlutspilUdfald(Model, Pladser[p].reshape(-1, 2)).astype(np.int32)
+            while Cache and sum(Værdi.size for Værdi in Cache.values()) + Veje.size > 2**26: # De ældste programmer smides ud
+                del Cache[next(iter(Cache))]
+            Cache[Nøgle] = Veje
+        Veje = Cache[Nøgle]
+
+        # Kun de bois der stadig kan flytte sig regnes eksakt, for en bid af udfaldene ad gangen
+        Del = max(1, Grænse // Veje.size)
+        for i in range(0, len(Rækker), Del):
+            r = Rækker[i:i + Del]
+            for j in np.flatnonzero(((Op[r] < Bedste[Åbne]) | (Ned[r] > Værste[Åbne])).any(axis=0)):
+                if Model['SlutspilBudget'] < 0: # Budgettet er brugt, og resten får kun grænser
+                    return Op, Ned
+                Model['SlutspilBudget'] -= len(r) * Veje.size
+
+                Bagud = Point[r, Åbne[j], None] - Point[r] # Formen (udfald, bois)
+                Antal = (Veje - Veje[:, Åbne[j], None] > Bagud[:, None]).sum(axis=2) # Bois foran i hver vej, formen (udfald, veje)
+                Op[r, j], Ned[r, j] = Antal.min(axis=1), Antal.max(axis=1)
+                Bedste[Åbne[j]] = min(Bedste[Åbne[j]], Op[r, j].min())
+                Værste[Åbne[j]] = max(Værste[Åbne[j]], Ned[r, j].max())
+
+    return Op, Ned
+
+def StartPlaceringer(Model, Blokke, Grænse=2**16, Budget=2**27):
+    # Finder opnåelige placeringer at starte søgningen fra, så den kan beskære fra begyndelsen
+    # Hver boi prøver først de udfald der giver den mest og mindst, og forbedres så med lokal søgning over par af blokke
+    AntalBois = len(Model['FastePoint'])
+    Bedste = np.full(AntalBois, AntalBois)
+    Værste = np.full(AntalBois, -1)
+
+    def Opdater(Valg, Eksakt=True):
+        # Vurderer udfaldene i bidder på højst Grænse værdier og returnerer placeringerne, uden Eksakt kun grænser for dem
+        Del = max(1, Grænse // AntalBois)
+        return [np.concatenate(Værdier) for Værdier in zip(*[
+            VurderUdfald(Model, Blokke, list(Valg[:, i:i + Del]), slice(None), Bedste, Værste, Eksakt) for i in range(0, Valg.shape[1], Del)
+        ])]
+
+    # Grådige udfald, formen (blokke, 2 * bois), hvor de første bois søger op og de sidste ned
+    Relativ = [Blok['Point'] - Blok['Point'].mean(axis=1, keepdims=True) for Blok in Blokke]
+    Grådig = np.array([np.concatenate([R.argmax(axis=0), R.argmin(axis=0)]) for R in Relativ])
+    Placeringer = Opdater(Grådig)
+    if len(Blokke) < 3: # Med to blokke er søgningen i forvejen samlet
+        return Bedste, Værste
+
+    # Bois der ikke er nået til første- eller sidstepladsen får skiftet udfald i to blokke ad gangen,
+    # hvor kun det mest lovende efter grænserne regnes eksakt
+    for j in np.flatnonzero(np.concatenate([Bedste > 0, Værste < AntalBois - 1])):
+        b, Ned = j % AntalBois, j >= AntalBois
+        Valg, Forrige, Nu = Grådig[:, j].copy(), None, Placeringer[int(Ned)][j, b]
+        while not np.array_equal(Valg, Forrige): # Indtil ingen par af blokke kan forbedre placeringen
+            Forrige = Valg
+            for g, h in combinations(range(len(Blokke)), 2):
+                if min(Budget, Model['SlutspilBudget']) < 0 or (Værste[b] == AntalBois - 1 if Ned else Bedste[b] == 0):
+                    break
+                G, H = np.meshgrid(np.arange(len(Blokke[g]['Point'])), np.arange(len(Blokke[h]['Point'])), indexing='ij')
+                Forsøg = np.repeat(Valg[:, None], G.size, axis=1)
+                Forsøg[g], Forsøg[h] = G.ravel(), H.ravel()
+                Grænser = Opdater(Forsøg, Eksakt=False)[int(Ned)][:, b]
+                k = Grænser.argmax() if Ned else Grænser.argmin()
+                Budget -= Forsøg.shape[1] * AntalBois
+                if Grænser[k] > Nu if Ned else Grænser[k] < Nu:
+                    Placering = Opdater(Forsøg[:, k:k + 1])[int(Ned)][0, b]
+                    if Placering > Nu if Ned else Placering < Nu: # Kun ved en egentlig forbedring
+                        Valg, Nu = Forsøg[:, k], Placering
+
+    return Bedste, Værste
+
+def SøgPlaceringer(Model, Blokke, Første, Bedste, Værste, Grænse=2**16):
+    # Gennemsøger udfaldene blok for blok med branch-and-bound og forbedrer bois' bedste og værste placering (0 er førstepladsen)
+    # Hver gren følger kun de bois hvis bedste eller værste placering stadig kan ændres, og de to sidste blokke regnes samlet.
+    # Returnerer også om søgningen blev afbrudt af Model['SlutspilBudget']
+    AntalBois = len(Model['FastePoint'])
+    Bedste, Værste = Bedste.copy(), Værste.copy()
+
+    # Hvor meget hver boi højst kan tage ind på hver anden boi i de resterende blokke, formen (blokke + 1, bois, bois)
+    RestMaks = np.cumsum([Model['SlutspilParvis']] + [ParvisMaks(Blok['Point']) for Blok in Blokke[::-1]], axis=0)[::-1]
+
+    def Søg(b, Point, Valg, Åbne):
+        if Model['SlutspilBudget'] < 0: # Søgningen er afbrudt
+            return
+        Udfald = Første if b == 0 else np.arange(len(Blokke[b]['Point']))
+        if b == len(Blokke) - 1: # Kun én blok i alt
+            VurderUdfald(Model, Blokke, [Udfald], Åbne, Bedste, Værste)
+            return
+
+        # Grænser for alle udfald på én gang, og hvilke af de åbne bois hvert udfald stadig kan flytte
+        NytPoint = Point + Blokke[b]['Point'][Udfald] # Formen (udfald, bois)
+        Op, Ned = ParvisPlaceringer(NytPoint, RestMaks[b + 1][:, Åbne], RestMaks[b + 1][Åbne].T, Åbne, Grænse)
+        Levende = ((Op < Bedste[Åbne]) | (Ned > Værste[Åbne])).any(axis=1)
+        Udfald, NytPoint, Op, Ned = Udfald[Levende], NytPoint[Levende], Op[Levende], Ned[Levende]
+
+        if b == len(Blokke) - 2: # De to sidste blokke vurderes samlet for alle kombinationer, i bidder
+            Sidste = np.arange(len(Blokke[-1]['Point']))
+            Del = max(1, Grænse // (AntalBois * len(Sidste)))
+            for i in range(0, len(Udfald), Del):
+                Åbne = Åbne[(Bedste[Åbne] > 0) | (Værste[Åbne] < AntalBois - 1)] # Bois på yderpladserne kan ikke flytte sig mere
+                if len(Åbne) and Model['SlutspilBudget'] >= 0:
+                    VurderUdfald(Model, Blokke, Valg + [np.repeat(Udfald[i:i + Del], len(Sidste)), np.tile(Sidste, len(Udfald[i:i + Del]))], Åbne, Bedste, Værste)
+            return
+
+        for i, o in enumerate(Udfald):
+            Stadig = (Op[i] < Bedste[Åbne]) | (Ned[i] > Værste[Åbne]) # De tidligere grene kan have lukket nogle bois
+            if Stadig.any():
+                Søg(b + 1, NytPoint[i], Valg + [o], Åbne[Stadig])
+
+    Søg(0, Model['FastePoint'], [], np.arange(AntalBois))
+
+    return Bedste, Værste, Model['SlutspilBudget'] < 0
+
+def LavIndikator(Koder, AntalKoder):
+    # Laver en 0/1-matrix over (kamp, kode) ud fra koder af formen (bois, kampe), negative koder udelades
+    # Kun par der forekommer får en kolonne, så matrixprodukter kan bruge BLAS. Returnerer også kolonnernes kamp * AntalKoder + kode
+    Boi, Kamp = np.nonzero(Koder >= 0)
+    Kolonner, Kolonne = np.unique(Kamp * AntalKoder + Koder[Boi, Kamp], return_inverse=True)
+    Indikator = np.zeros((Koder.shape[0], len(Kolonner)), dtype=np.float32)
+    Indikator[Boi, Kolonne] = 1
+    return Indikator, Kolonner
+
+def ForventedeBudPoint(Sandsynligheder):
+    # Forventede point for hvert muligt bud i hver kamp, Sandsynligheder har formen (kampe, MaksMål+1, MaksMål+1) over resultater
+    Scorer = ScenarieGitter(1, Sandsynligheder.shape[-1] - 1)[:, 0] # Samme rækkefølge som Sandsynligheder lagt ud
+    Gevinst = BeregnKampPoint(Scorer[:, None], Scorer[None, :]) # Formen (bud, resultater)
+    return Sandsynligheder.reshape(len(Sandsynligheder), -1) @ Gevinst.T, Scorer
+
+def OptimerBud(Sandsynligheder, Kampe, GruppeHold, Kort, Vinder, Bonus, KandidaterPrUdfald=2):
+    # Finder bud på alle kampe med flest forventede point, inklusive bonus for den gruppevinder buddene giver
+    # Vinder er sandsynligheden for at hvert hold vinder sin gruppe
+    Forventet, Scorer = ForventedeBudPoint(Sandsynligheder) # Formen (kampe, bud)
+    Bud = Forventet.argmax(axis=1)
+    Vindere = np.zeros(len(GruppeHold), dtype=int)
+
+    # Kandidater er de bedste bud på hver kamp for hvert udfald, så bonussen kan vælge en anden vinder. Søgningen er kun
+    # eksakt over kandidaterne, et bud uden for de KandidaterPrUdfald bedste i sit udfald prøves ikke
+    Udfald = np.sign(Scorer[:, 0] - Scorer[:, 1])
+    Kandidater = np.concatenate([
+        np.argsort(np.where(Udfald == u, -Forventet, np.inf), axis=1, kind='stable')[:, :KandidaterPrUdfald] for u in (1, 0, -1)
+    ], axis=1)
+    AntalKandidater = Kandidater.shape[1]
+
+    for g, Gruppe in enumerate(GruppeHold):
+        I = np.flatnonzero(np.isin(Kampe[:, 0], Gruppe))
+        Lokal = (Kampe[I, :, None] == Gruppe).argmax(axis=-1) # Holdenes plads i gruppen, formen (kampe i gruppen, 2)
+
+        # Hver kandidats bidrag til gruppetabellen, formen (kampe i gruppen, kandidater, hold i gruppe, 3)
+        Bidrag = BeregnTabel(Lokal[:, None, None], Scorer[Kandidater[I]][:, :, None], len(Gruppe))
+
+        # Kombinationerne lægges sammen kamp for kamp i samme rækkefølge som meshgrid med indexing='ij'
+        Tabel = np.zeros((1, len(Gruppe), 3), dtype=int)
+        Point = np.zeros(1)
+        for k, i in enumerate(I):
+            Tabel = (Tabel[:, None] + Bidrag[k][None]).reshape(-1, len(Gruppe), 3)
+            Point = (Point[:, None] + Forventet[i, Kandidater[i]][None]).reshape(-1)
+
+        # Gruppevinderen ifølge hver kombination af bud, rangeret som bois' gruppestillinger
+        bVindere = Gruppe[Rangorden(Tabel, Kort[Gruppe])[:, 0]]
+
+        Bedste = (Point + Bonus * Vinder[bVindere]).argmax()
+        Bud[I] = Kandidater[I, np.unravel_index(Bedste, (AntalKandidater,) * len(I))]
+        Vindere[g] = bVindere[Bedste]
+
+    return Scorer[Bud], Forventet[np.arange(len(Bud)), Bud], Vindere
+
+DatabaseSkema = """
+CREATE TABLE IF NOT EXISTS Meta (Nøgle TEXT PRIMARY KEY, Værdi TEXT);
+CREATE TABLE IF NOT EXISTS Hold (Id INTEGER PRIMARY KEY, Navn TEXT NOT NULL UNIQUE, Gruppe TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS Kampe (Id INTEGER PRIMARY KEY, Hold1 INTEGER NOT NULL REFERENCES Hold, Hold2 INTEGER NOT NULL REFERENCES Hold);
+CREATE TABLE IF NOT EXISTS Resultater (
+    Nummer INTEGER PRIMARY KEY, Kamp INTEGER REFERENCES Kampe, Mål1 INTEGER NOT NULL, Mål2 INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ResultaterKamp ON Resultater (Kamp);
+CREATE TABLE IF NOT EXISTS Bois (Id INTEGER PRIMARY KEY, Navn TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS Bud (
+    Boi INTEGER NOT NULL REFERENCES Bois, Kamp INTEGER NOT NULL REFERENCES Kampe, Mål1 INTEGER NOT NULL, Mål2 INTEGER NOT NULL,
+    PRIMARY KEY (Boi, Kamp)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS BudKamp ON Bud (Kamp);
+CREATE TABLE IF NOT EXISTS Point (
+    Boi INTEGER NOT NULL REFERENCES Bois, Resultat INTEGER NOT NULL REFERENCES Resultater, Point INTEGER NOT NULL,
+    PRIMARY KEY (Boi, Resultat)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS PointResultat ON Point (Resultat);
+CREATE TABLE IF NOT EXISTS SlutspilBud (
+    Boi INTEGER NOT NULL REFERENCES Bois, Runde INTEGER NOT NULL, Hold INTEGER NOT NULL REFERENCES Hold,
+    PRIMARY KEY (Boi, Runde, Hold)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS SlutspilPoint (
+    Boi INTEGER NOT NULL REFERENCES Bois, Runde INTEGER NOT NULL, Point INTEGER NOT NULL, PRIMARY KEY (Boi, Runde)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS Stilling (
+    Boi INTEGER PRIMARY KEY REFERENCES Bois, Placering INTEGER NOT NULL, Point INTEGER NOT NULL,
+    GrupperPoint INTEGER NOT NULL, Bonus INTEGER NOT NULL, SlutspilPoint INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS StillingPlacering ON Stilling (Placering);
+"""
+
+def ÅbnDatabase(Sti):
+    # Åbner databasen i WAL-tilstand, så flere processer kan læse mens en anden skriver
+    Forbindelse = sqlite3.connect(Sti, timeout=30)
+    Forbindelse.execute('PRAGMA journal_mode=WAL')
+    Forbindelse.executescript(DatabaseSkema)
+    return Forbindelse
+
+def HentStilling(Sti, Antal=-1):
+    # Læser stillingen for bois fra databasen i placeringsrækkefølge, Antal begrænser til toppen
+    Forbindelse = ÅbnDatabase(Sti)
+    try:
+        return pd.read_sql_query(
+            'SELECT Bois.Navn AS Boi, Stilling.Point FROM Stilling JOIN Bois ON Bois.Id = Stilling.Boi '
+            'ORDER BY Stilling.Placering LIMIT ?',
+            Forbindelse, params=(Antal,)
+        )
+    finally:
+        Forbindelse.close()
+
+def HentBoi(Sti, Boi):
+    # Læser én bois bud, resultater og point for hver spillet kamp fra databasen
+    Forbindelse = ÅbnDatabase(Sti)
+    try:
+        return pd.read_sql_query(
+            'SELECT Hold1.Navn AS "Hold 1", Hold2.Navn AS "Hold 2", Resultater.Mål1 AS "Mål 1", Resultater.Mål2 AS "Mål 2", '
+            'Bud.Mål1 AS "Bud 1", Bud.Mål2 AS "Bud 2", Point.Point '
+            'FROM Bois JOIN Point ON Point.Boi = Bois.Id JOIN Resultater ON Resultater.Nummer = Point.Resultat '
+            'JOIN Kampe ON Kampe.Id = Resultater.Kamp JOIN Hold AS Hold1 ON Hold1.Id = Kampe.Hold1 JOIN Hold AS Hold2 ON Hold2.Id = Kampe.Hold2 '
+            'JOIN Bud ON Bud.Boi = Bois.Id AND Bud.Kamp = Resultater.Kamp '
+            'WHERE Bois.Navn = ? ORDER BY Resultater.Nummer',
+            Forbindelse, params=(Boi,)
+        )
+    finally:
+        Forbindelse.close()
+
 class TBTFEuro:
-    def __init__(self):
-        self.Grupper = {
-            'Gruppe A': ['Tyskland', 'Skotland', 'Ungarn', 'Schweiz'],
-            'Gruppe B': ['Spanien', 'Kroatien', 'Italien', 'Albanien'],
-            'Gruppe C': ['Slovenien', 'Danmark', 'Serbien', 'England'],
-            'Gruppe D': ['Polen', 'Holland', 'Østrig', 'Frankrig'],
-            'Gruppe E': ['Belgien', 'Slovakiet', 'Rumænien', 'Ukraine'],
-            'Gruppe F': ['Tyrkiet', 'Georgien', 'Portugal', 'Tjekkiet']
+    # Beregningens trin med de trin de afhænger af og de attributter de beregner, trinnene køres først når en attribut bruges
+    Trin = {
+        '_ImporterGrupperResultater': ([], ['GrupperResultater', 'GrupperResultaterHold', 'GrupperResultaterMål']),
+        '_BeregnGrupperStilling': (['_ImporterGrupperResultater'], ['StillingTabel', 'Placeringer', 'Tredjepladser']),
+        '_LavGrupperStilling': (['_BeregnGrupperStilling'], ['StillingGrupper', 'StillingTredjepladser']),
+        '_ImporterBud': ([], ['GrupperBud', 'GrupperBudBois', 'GrupperBudAntal', 'GrupperBudHold', 'GrupperBudMål']),
+        '_IndekserBud': (['_ImporterBud'], ['bKampMål']),
+        '_BeregnGrupperBois': (['_ImporterGrupperResultater', '_IndekserBud'], ['GrupperBoisPointMatrix']),
+        '_LavGrupperBoisPoint': (['_BeregnGrupperBois'], ['GrupperBoisPoint']),
+        '_BeregnGrupperStillingBois': (
+            ['_BeregnGrupperStilling', '_ImporterBud'],
+            ['bStillingTabel', 'bPlaceringer', 'bTredjepladser', 'bStillingGrupperSamlet', 'bKorrekteGruppevindere']
+        ),
+        '_BeregnStillingDiff': (
+            ['_BeregnGrupperStilling', '_BeregnGrupperStillingBois'],
+            ['bStillingTabelUdvidet', 'bPlaceringDiff', 'bStatDiff']
+        ),
+        '_ImporterSlutspilResultater': ([], ['SlutspilResultater']),
+        '_BestemOttendedelsfinaler': (['_ImporterSlutspilResultater', '_BeregnGrupperStilling'], ['Ottendedelsfinaler']),
+        '_BestemSlutspil': (
+            ['_BestemOttendedelsfinaler'],
+            ['Ottendedelsfinalister', 'Kvartfinalister', 'Semifinalister', 'Finalister', 'Vinder', 'SlutspilPladser', 'SlutspilMasker']
+        ),
+        '_ImporterSlutspilBud': ([], ['SlutspilBud', 'SlutspilBudRunder', 'SlutspilBudBois', 'SlutspilBudMasker']),
+        '_BeregnSlutspilBois': (['_BestemSlutspil', '_ImporterSlutspilBud'], ['SlutspilBoisPointMatrix', 'SlutspilBoisPoint']),
+        '_BeregnBoisStilling': (['_BeregnGrupperBois', '_BeregnGrupperStillingBois', '_BeregnSlutspilBois'], ['BoisStilling']),
+        '_BeregnParvis': (['_ImporterGrupperResultater', '_IndekserBud'], ['ParvisUdfald', 'ParvisResultater', 'ParvisSving'])
+    }
+
+    def __init__(self, BudKilde=None, Konfiguration=None):
+        Konfiguration = LæsKonfiguration(Konfiguration)
+        self.Konfiguration = Konfiguration
+        self.Grupper = Konfiguration['Grupper']
+        self.GrupperKort = Konfiguration['GrupperKort']
+        self.bois = Konfiguration['bois']
+        self.Filer = Konfiguration['Filer']
+        self.SlutspilRunder = Konfiguration['Point']['Slutspil']
+        self.GruppevinderBonus = Konfiguration['Point']['Gruppevinder']
+
+        self.Hold = [land for lande in self.Grupper.values() for land in lande] # Nummererer hold til arrays
+        self.HoldIndeks = {land: idx for idx, land in enumerate(self.Hold)}
+        self.GruppeHold = np.array([[self.HoldIndeks[land] for land in lande] for lande in self.Grupper.values()])
+        self.Kort = np.array([
+            self.GrupperKort.get(land, {}).get('Gule kort', 0) + self.GrupperKort.get(land, {}).get('Røde kort', 0) for land in self.Hold
+        ], dtype=int)
+
+        # Gruppekampene og et indeks fra (Hold 1, Hold 2) i begge retninger til kampens nummer
+        self.Kampe = np.array([kamp for lande in self.GruppeHold for kamp in combinations(lande.tolist(), 2)], dtype=int).reshape(-1, 2)
+        self.KampOpslag = np.full((len(self.Hold), len(self.Hold)), -1, dtype=int)
+        self.KampOpslag[self.Kampe[:, 0], self.Kampe[:, 1]] = np.arange(len(self.Kampe))
+        self.KampOpslag[self.Kampe[:, 1], self.Kampe[:, 0]] = np.arange(len(self.Kampe))
+
+        self.BudKilde = BudKilde or Konfiguration.get('BudKilde') # Mappe eller lang fil med bud til store puljer, ellers bruges Bud.xlsx
+        self.Mappe = os.path.abspath(Konfiguration.get('Mappe') or os.getcwd()) # Filerne læses først når de bruges, så mappen huskes fra start
+        if self.BudKilde is not None:
+            self.BudKilde = os.path.join(self.Mappe, self.BudKilde)
+        self._Beregnet = set() # Trin der er beregnet og stadig gyldige
+        self._Versioner = {} # Tælles op hver gang et trin nulstilles, så gemt HTML kan kendes som forældet
+        self._HtmlCache = {}
+        self._Måling = None # Målinger af trin og tællere, slået fra indtil _StartMåling kaldes
+
+    def __getattr__(self, navn):
+        # Kalder kun når en attribut mangler og beregner den med det trin der laver den
+        for trin, (_, Attributter) in TBTFEuro.Trin.items():
+            if navn in Attributter:
+                self._Kør(trin)
+                return object.__getattribute__(self, navn)
+
+        raise AttributeError(f"'TBTFEuro' object has no attribute '{navn}'")
+
+    def _Kør(self, trin):
+        # Kører et trin efter de trin det afhænger af, medmindre det allerede er beregnet
+        if trin in self._Beregnet:
+            return
+
+        for afhængighed in TBTFEuro.Trin[trin][0]:
+            self._Kør(afhængighed)
+
+        if self._Måling is None:
+            getattr(self, trin)()
+        else:
+            self._Mål('Trin', trin, getattr(self, trin))
+        self._Beregnet.add(trin)
+
+    def _Nulstil(self, trin):
+        # Glemmer et trin og alle trin der afhænger af det, så de beregnes igen næste gang de bruges
+        self._Beregnet.discard(trin)
+        self._Versioner[trin] = self._Versioner.get(trin, 0) + 1
+        for attribut in TBTFEuro.Trin[trin][1]:
+            self.__dict__.pop(attribut, None)
+
+        for andet, (Afhængigheder, _) in TBTFEuro.Trin.items():
+            if trin in Afhængigheder:
+                self._Nulstil(andet)
+
+    def _HentTrin(self, Trin):
+        # Henter attributterne fra nogle trin, så de kan gives videre til en anden pulje
+        Værdier = {}
+        for trin in Trin:
+            self._Kør(trin)
+            Værdier.update({attribut: getattr(self, attribut) for attribut in TBTFEuro.Trin[trin][1]})
+        return Værdier
+
+    def _IndsætTrin(self, Værdier, Trin):
+        # Sætter attributterne fra _HentTrin og markerer trinnene som beregnet, så de ikke beregnes igen
+        self.__dict__.update(Værdier)
+        self._Beregnet.update(Trin)
+
+    def _HentHtml(self, Nøgle, Trin, Lav):
+        # Henter gemt HTML, som kun laves igen når et af de trin den bygger på er nulstillet siden
+        Version = tuple(self._Versioner.get(trin, 0) for trin in Trin)
+        if self._HtmlCache.get(Nøgle, (None,))[0] != Version:
+            self._HtmlCache[Nøgle] = (Version, Lav() if self._Måling is None else self._Mål('Html', Nøgle[0], Lav))
+        else:
+            self._Tæl('HTML fra cache', 1)
+
+        return self._HtmlCache[Nøgle][1]
+
+    def _StartMåling(self, Tilbagekald=None, Hukommelse=False):
+        # Slår måling af tid, kald og allokeringer pr. trin til, Tilbagekald(Type, Navn, Måling) kaldes efter hvert trin
+        self._Måling = {
+            'Trin': {},
+            'Tællere': {},
+            'Tilbagekald': Tilbagekald,
+            'Hukommelse': Hukommelse,
+            'Toppe': [], # De ydre igangværende trins højeste allokering indtil nu, når et indre trin nulstiller toppen
+            'StartetTracemalloc': Hukommelse and not tracemalloc.is_tracing()
         }
-
-        self.GrupperKort = {
-            'Skotland': {'Gule kort': 5, 'Røde kort': 1},
-            'Belgien': {'Gule kort': 5, 'Røde kort': 0},
-            'England': {'Gule kort': 4, 'Røde kort': 0},
-            'Frankrig': {'Gule kort': 3, 'Røde kort': 0},
-            'Ukraine': {'Gule kort': 3, 'Røde kort': 0},
-            'Holland': {'Gule kort': 2, 'Røde kort': 0},
-            'Slovakiet': {'Gule kort': 2, 'Røde kort': 0},
-            'Rumænien': {'Gule kort': 7, 'Røde kort': 0},
-            'Italien': {'Gule kort': 7, 'Røde kort': 0},
-            'Portugal': {'Gule kort': 7, 'Røde kort': 0},
-            'Albanien': {'Gule kort': 7, 'Røde kort': 0},
-            'Slovenien': {'Gule kort': 7, 'Røde kort': 0},
-            'Danmark': {'Gule kort': 6, 'Røde kort': 0},
-            'Georgien': {'Gule kort': 6, 'Røde kort': 0},
-            'Spanien': {'Gule kort': 5, 'Røde kort': 0},
-            'Tyskland': {'Gule kort': 5, 'Røde kort': 0},
-            'Tyrkiet': {'Gule kort': 16, 'Røde kort': 0},
-            'Tjekkiet': {'Gule kort': 13, 'Røde kort': 2},
-            'Østrig': {'Gule kort': 10, 'Røde kort': 0},
-            'Ungarn': {'Gule kort': 10, 'Røde kort': 0},
-            'Serbien': {'Gule kort': 9, 'Røde kort': 0},
-            'Polen': {'Gule kort': 8, 'Røde kort': 0},
-            'Schweiz': {'Gule kort': 8, 'Røde kort': 0},
-            'Kroatien': {'Gule kort': 7, 'Røde kort': 0}
+        if self._Måling['StartetTracemalloc']:
+            tracemalloc.start()
+
+    def _StopMåling(self):
+        # Slår måling fra igen og returnerer målingerne
+        Måling = self._HentMåling()
+        if self._Måling is not None and self._Måling['StartetTracemalloc']:
+            tracemalloc.stop()
+        self._Måling = None
+
+        return Måling
+
+    def _HentMåling(self):
+        # Returnerer målingerne som almindelige dicts, der kan sendes videre til f.eks. et metrics-system
+        if self._Måling is None:
+            return {'Trin': {}, 'Tællere': {}}
+
+        return {
+            'Trin': {navn: dict(værdier) for navn, værdier in self._Måling['Trin'].items()},
+            'Tællere': dict(self._Måling['Tællere'])
         }
 
-        self.bois = ['Gustav',
-                     'Findsen',
-                     'Mads',
-                     'Kris',
-                     'Jens',
-                     'Thomas',
-                     'Rasmus'
-        ]
-
-        self._ImporterGrupperResultater()
-        self._BeregnGrupperStilling()
-        self._ImporterBud()
-        self._BeregnGrupperBois()
-        self._BeregnGrupperStillingBois()
-        self._ImporterSlutspilResultater()
-        self._BestemSlutspil()
-        self._ImporterSlutspilBud()
-        self._BeregnSlutspilBois()
+    def _Mål(self, Type, Navn, Funktion):
+        # Kører Funktion og lægger tid og allokeringer til målingerne for Navn
+        # Toppen nulstilles for hvert trin, så det ydre trins top gemmes først og får det indre trins top lagt til bagefter
+        Hukommelse = self._Måling['Hukommelse'] and tracemalloc.is_tracing()
+        Toppe = self._Måling['Toppe']
+        if Hukommelse:
+            Før, Top = tracemalloc.get_traced_memory()
+            if Toppe:
+                Toppe[-1] = max(Toppe[-1], Top)
+            Toppe.append(Før)
+            tracemalloc.reset_peak()
+
+        Start = time.perf_counter()
+        try:
+            Resultat = Funktion()
+        finally:
+            if Hukommelse:
+                Top = max(Toppe.pop(), tracemalloc.get_traced_memory()[1])
+                if Toppe:
+                    Toppe[-1] = max(Toppe[-1], Top)
+        Sekunder = time.perf_counter() - Start
+
+        Måling = {'Sekunder': Sekunder}
+        if Hukommelse:
+            Måling.update({'Allokeret': tracemalloc.get_traced_memory()[0] - Før, 'TopAllokeret': Top - Før})
+
+        Samlet = self._Måling['Trin'].setdefault(f'{Type}:{Navn}', {'Kald': 0, 'Sekunder': 0.0, 'Allokeret': 0, 'TopAllokeret': 0})
+        Samlet['Kald'] += 1
+        Samlet['Sekunder'] += Sekunder
+        Samlet['Allokeret'] += Måling.get('Allokeret', 0)
+        Samlet['TopAllokeret'] = max(Samlet['TopAllokeret'], Måling.get('TopAllokeret', 0))
+
+        if self._Måling['Tilbagekald'] is not None:
+            self._Måling['Tilbagekald'](Type, Navn, Måling)
+
+        return Resultat
+
+    def _Tæl(self, Navn, Antal):
+        # Lægger til en tæller når målingen er slået til, Antal kan være et array der summeres
+        if self._Måling is not None:
+            Tællere = self._Måling['Tællere']
+            Tællere[Navn] = Tællere.get(Navn, 0) + int(np.sum(Antal))
 
     def _ImporterGrupperResultater(self):
         # Importerer resultater fra gruppespillet
-        ResultatFil = 'Resultater.xlsx' # Definerer resultatfil
+        GrupperResultater = self._LæsGrupperResultater()
+        self.GrupperResultaterHold, self.GrupperResultaterMål = KoderKampe(GrupperResultater, self.HoldIndeks) # Koder til arrays
+
+        self.GrupperResultater = GrupperResultater.to_dict(orient='records') # Konverterer til dict
+
+    def _LæsGrupperResultater(self):
+        # Læser resultatfilen for gruppespillet som DataFrame
+        ResultatFil = os.path.join(self.Mappe, self.Filer['Resultater']) # Definerer resultatfil
 
-        self.GrupperResultater = pd.read_excel( # Indlæser resultatfil
+        GrupperResultater = LæsExcel( # Indlæser resultatfil
             ResultatFil,
             header=None,
             names=['Hold 1', 'Hold 2', 'Mål 1', 'Mål 2']
         ).dropna()
-        self.GrupperResultater[['Mål 1', 'Mål 2']] = self.GrupperResultater[['Mål 1', 'Mål 2']].astype(int) # Konverterer 'Mål' til int
+        GrupperResultater[['Mål 1', 'Mål 2']] = GrupperResultater[['Mål 1', 'Mål 2']].astype(int) # Konverterer 'Mål' til int
 
-        self.GrupperResultater = self.GrupperResultater.to_dict(orient='records') # Konverterer til dict
+        return GrupperResultater
 
     def _BeregnGrupperStilling(self):
         # Beregner faktisk stilling i gruppespillet
-        self.StillingSamlet = {} # Definerer tom dict til samlet stilling
-        self.StillingGrupper = {} # Definerer tom dict til gruppestillinger
-        self.StillingTredjepladser = {} # Definerer tom dict til tredjepladser
-
-        for gruppe, lande in self.Grupper.items(): # Fylder dict med variable for hvert land
-            for land in lande:
-                self.StillingSamlet[land] = {
-                    'Point': 0, 
-                    'Mål for': 0, 
-                    'Mål imod': 0, 
-                    'Målforskel': 0,
-                    'Kort': 0
-                }
-        
-        for resultat in self.GrupperResultater: # Beregner point fra faktiske resultater
-            if resultat['Mål 1'] > resultat['Mål 2']: # Hold 1 vinder
-                self.StillingSamlet[resultat['Hold 1']]['Point'] += 3
-            if resultat['Mål 1'] < resultat['Mål 2']: # Hold 2 vinder
-                self.StillingSamlet[resultat['Hold 2']]['Point'] += 3
-            if resultat['Mål 1'] == resultat['Mål 2']: # Uafgjort
-                self.StillingSamlet[resultat['Hold 1']]['Point'] += 1
-                self.StillingSamlet[resultat['Hold 2']]['Point'] += 1
-            
-            self.StillingSamlet[resultat['Hold 1']]['Mål for'] += resultat['Mål 1'] # Beregner mål for og imod
-            self.StillingSamlet[resultat['Hold 1']]['Mål imod'] += resultat['Mål 2']
-            self.StillingSamlet[resultat['Hold 2']]['Mål for'] += resultat['Mål 2']
-            self.StillingSamlet[resultat['Hold 2']]['Mål imod'] += resultat['Mål 1']
-
-        for land, værdier in self.StillingSamlet.items(): # Beregner målforskel og disciplin
-            værdier['Målforskel'] = værdier['Mål for'] - værdier['Mål imod']
-            værdier['Kort'] = self.GrupperKort[land]['Gule kort'] + self.GrupperKort[land]['Røde kort']
-            
-        for gruppe, lande in self.Grupper.items():
-            dict = {land: self.StillingSamlet[land] for land in lande}
-            df = pd.DataFrame.from_dict(dict, orient='index')
+        self.StillingTabel = BeregnTabel(self.GrupperResultaterHold, self.GrupperResultaterMål, len(self.Hold))
+        self.Placeringer, self.Tredjepladser = RangerGrupper(self.StillingTabel, self.GruppeHold, self.Kort)
 
-            self.StillingGrupper[gruppe] = df.sort_values(
-                by=['Point', 'Målforskel', 'Mål for', 'Kort'], 
-                ascending=[False, False, False, True]
-            )
+    def _LavGrupperStilling(self):
+        # Laver DataFrames med faktisk stilling i gruppespillet
+        self.StillingGrupper, self.StillingTredjepladser = self._LavStilling(
+            self.StillingTabel, self.Placeringer, self.Tredjepladser
+        )
+
+    def _LavStilling(self, Tabel, Placeringer, Tredjepladser):
+        # Bygger DataFrames med gruppestillinger og tredjepladser ud fra arrays
+        Værdier = np.column_stack([Tabel, Tabel[:, 1] - Tabel[:, 2]])
+        Kolonner = ['Point', 'Mål for', 'Mål imod', 'Målforskel']
 
-            TredjeRække = self.StillingGrupper[gruppe].iloc[[2]]
-            TredjeLand = TredjeRække.index[0]
-            self.StillingTredjepladser[TredjeLand] = TredjeRække.to_dict(orient='index')[TredjeLand]
+        StillingGrupper = {
+            gruppe: pd.DataFrame(Værdier[Placeringer[g]], index=[self.Hold[h] for h in Placeringer[g]], columns=Kolonner)
+            for g, gruppe in enumerate(self.Grupper)
+        }
+        StillingTredjepladser = pd.DataFrame(Værdier[Tredjepladser], index=[self.Hold[h] for h in Tredjepladser], columns=Kolonner)
+        self._Tæl('DataFrames bygget', len(StillingGrupper) + 1)
 
-            self.StillingGrupper[gruppe] = self.StillingGrupper[gruppe].drop('Kort', axis='columns')
-        
-        self.StillingTredjepladser = pd.DataFrame.from_dict(self.StillingTredjepladser, orient='index').sort_values(
-            by=['Point', 'Målforskel', 'Mål for', 'Kort'], ascending=[False, False, False, True]).drop('Kort', axis='columns')
+        return StillingGrupper, StillingTredjepladser
             
     def _VisGrupperStilling(self):
         # Viser gruppestillinger
-        def formattering(s, tredjepladser):
-            formattering = []
-            for idx in range(len(s)):
-                if s.index[idx] in tredjepladser:
-                    formattering.append('background-color: rgba(0, 209, 0, 0.12)') 
-                elif idx < 1:
-                    formattering.append('background-color: rgba(0, 209, 0, 0.5)') 
-                elif 0 < idx < 2:
-                    formattering.append('background-color: rgba(0, 209, 0, 0.25)') 
-                else:
-                    formattering.append('')
-            return formattering
+        display(HTML(self._HentHtml(('GrupperStilling',), ['_LavGrupperStilling'], self._LavGrupperStillingHtml)))
 
-        tredjepladser = self.StillingTredjepladser.index[:4].tolist()
-
-        html = "<div style='display: grid; grid-template-columns: repeat(3, 1fr); gap: 15px;'>"
-        for gruppe, df in self.StillingGrupper.items():
-            formateret_df = df.style.apply(formattering, axis=0, tredjepladser=tredjepladser).set_table_attributes('style="display:inline;margin:5px;"').set_caption(gruppe)
-            html += formateret_df._repr_html_()
-        html += "</div>"
-
-        html += "<div style='text-align:center; margin-top: 20px;'>"
-        formateret_tredjeplads_df = self.StillingTredjepladser.style.apply(formattering, axis=0, tredjepladser=tredjepladser).set_table_attributes('style="display:inline;margin:5px;"').set_caption('Bedste 3\'ere')
-        html += formateret_tredjeplads_df._repr_html_()
-        html += "</div>"
-
-        display(HTML(html))
+    def _LavGrupperStillingHtml(self):
+        # Laver HTML med gruppestillinger
+        return StilGrupper(self.StillingGrupper, self.StillingTredjepladser)
 
     def _ImporterBud(self):
         # Importer bois bud på gruppespillet
-        BudFil = 'Bud.xlsx'
-
-        self.GrupperBud = pd.read_excel(
-            BudFil,
-            sheet_name=None,
-            header=None,
-            names=['Hold 1', 'Hold 2', 'Mål 1', 'Mål 2']
-        )
-    
-        for boi, ark in self.GrupperBud.items():
-            ark = ark.dropna()
-            ark[['Mål 1', 'Mål 2']] = ark[['Mål 1', 'Mål 2']].astype(int)
-            ark = ark.to_dict(orient='records')
-            self.GrupperBud[boi] = ark
+        if self.BudKilde is not None: # Store puljer læses direkte til arrays
+            self._ImporterBudStrøm(self.BudKilde)
+            return
+
+        BudFil = os.path.join(self.Mappe, self.Filer['Bud'])
+
+        # Buddene læses direkte til arrays af formen (bois, kampe, 2), manglende bud er -1
+        self.GrupperBud = None
+        self.GrupperBudBois, self.GrupperBudAntal, self.GrupperBudHold, self.GrupperBudMål = LæsBudArk(BudFil, self.HoldIndeks)
+        self._Tæl('Bud indlæst', self.GrupperBudAntal)
+
+    def _ImporterBudStrøm(self, Kilde, ChunkStørrelse=100000):
+        # Importerer bois bud i bidder fra LæsBudStrøm direkte til int8-arrays uden en dict pr. bud
+        BoisIndeks = {}
+        Antal = np.zeros(0, dtype=int)
+        Hold = np.full((0, 0, 2), -1, dtype=np.int8)
+        Mål = np.full((0, 0, 2), -1, dtype=np.int8)
+
+        for Bid in LæsBudStrøm(Kilde, ChunkStørrelse):
+            Bid = Bid.dropna()
+            Koder, Navne = pd.factorize(Bid['Boi'])
+            b = np.array([BoisIndeks.setdefault(boi, len(BoisIndeks)) for boi in Navne], dtype=int)[Koder]
+
+            if len(BoisIndeks) > len(Antal): # Udvider arrays med plads til nye bois
+                Antal = np.concatenate([Antal, np.zeros(len(BoisIndeks) - len(Antal), dtype=int)])
+
+            Kamp = Antal[b] + pd.Series(b).groupby(b).cumcount().to_numpy() # Budets nummer hos boien
+            Antal += np.bincount(b, minlength=len(Antal))
+
+            AntalKampe = max(Antal.max(initial=0), Hold.shape[1])
+            if len(Antal) > len(Hold) or AntalKampe > Hold.shape[1]: # Pladsen til bois fordobles for at undgå mange kopier
+                Form = (max(len(Antal), 2 * len(Hold)), AntalKampe, 2)
+                NytHold, NyeMål = np.full(Form, -1, dtype=np.int8), np.full(Form, -1, dtype=np.int8)
+                NytHold[:len(Hold), :Hold.shape[1]] = Hold
+                NyeMål[:len(Mål), :Mål.shape[1]] = Mål
+                Hold, Mål = NytHold, NyeMål
+
+            bHold, bMål = KoderKampe(Bid, self.HoldIndeks)
+            Hold[b, Kamp] = bHold
+            Mål[b, Kamp] = bMål
+
+        self.GrupperBud = None # Buddene findes kun som arrays
+        self.GrupperBudBois = list(BoisIndeks)
+        self.GrupperBudAntal = Antal
+        self.GrupperBudHold = Hold[:len(Antal), :Antal.max(initial=0)].copy()
+        self.GrupperBudMål = Mål[:len(Antal), :Antal.max(initial=0)].copy()
+        self._Tæl('Bud indlæst', Antal)
+
+    def _IndekserBud(self):
+        # Lægger bois' bud på plads efter kamp i stedet for rækkefølge, vendte bud vendes og manglende bud er -1
+        Kamp, Vendt = FindKampe(self.GrupperBudHold, self.KampOpslag, self.Kampe)
+        Mål = np.where(Vendt[..., None], self.GrupperBudMål[..., ::-1], self.GrupperBudMål)
+
+        self.bKampMål = np.full((len(self.GrupperBudBois), len(self.Kampe), 2), -1, dtype=np.int8) # Formen (bois, kampe, 2)
+        b, k = np.nonzero(Kamp >= 0)
+        self.bKampMål[b, Kamp[b, k]] = Mål[b, k]
 
     def _BeregnGrupperBois(self):
-        # Beregner point i gruppespillet for bois' bud
-        self.GrupperBoisPoint = {boi: [] for boi in self.GrupperBud.keys()}
-
-        for boi in self.GrupperBud.keys():
-            for kamp, værdi in enumerate(self.GrupperBud[boi]):
-                if kamp < len(self.GrupperResultater): # Tjekker kun bud så længe der er resultater
-                    bHold1 = værdi['Hold 1'] # Definerer hold i bud
-                    bHold2 = værdi['Hold 2']
-
-                    Hold1 = self.GrupperResultater[kamp]['Hold 1'] # Definerer hold i kamp
-                    Hold2 = self.GrupperResultater[kamp]['Hold 2']
-
-                    bMål1 = værdi['Mål 1'] # Definerer mål i bud
-                    bMål2 = værdi['Mål 2']
-
-                    Mål1 = self.GrupperResultater[kamp]['Mål 1'] # Definerer mål i kamp
-                    Mål2 = self.GrupperResultater[kamp]['Mål 2']
-
-                    if bMål1 > bMål2: # Definerer vinder i bud
-                        bVinder = bHold1
-                    elif bMål1 < bMål2:
-                        bVinder = bHold2
-                    else:
-                        bVinder = 'Uafgjort'
-
-                    if Mål1 > Mål2: # Definerer vinder i kamp
-                        Vinder = Hold1
-                    elif Mål1 < Mål2:
-                        Vinder = Hold2
-                    else:
-                        Vinder = 'Uafgjort'
-
-                    if [bHold1, bHold2] == [Hold1, Hold2]: # Tjekker at kamp og bud er på samme hold
-                        if [bMål1, bMål2] == [Mål1, Mål2]: # Regel 1: Resultat og begge målscorer
-                            bPoint = 7
-                        elif (bMål1 == Mål1 or bMål2 == Mål2) and bVinder == Vinder: # Regel 2: Resultat og én målscore
-                            bPoint = 4
-                        elif bVinder == Vinder: # Regel 3: Resultat
-                            bPoint = 3
-                        elif bMål1 == Mål1 or bMål2 == Mål2: # Regel 4: Én målscore
-                            bPoint = 1
-                        else:
-                            bPoint = 0
-                    else:
-                        bPoint = np.nan
-                    
-                    self.GrupperBoisPoint[boi].append(bPoint)
-
-        # Beregner samlet stilling for bois
-        PointSum = {boi: sum(filter(lambda x: x == x, bPoint)) for boi, bPoint in self.GrupperBoisPoint.items()}
-
-        self.BoisStilling = pd.DataFrame(list(PointSum.items()), columns=['Boi', 'Point'])
-        self.BoisStilling = self.BoisStilling.sort_values(by='Point', ascending=False).reset_index(drop=True)
+        # Beregner point i gruppespillet for bois' bud ved at slå hvert resultats kamp op blandt buddene
+        Kamp, Vendt = FindKampe(self.GrupperResultaterHold, self.KampOpslag, self.Kampe)
+        Mål = np.where(Vendt[:, None], self.GrupperResultaterMål[:, ::-1], self.GrupperResultaterMål)
+
+        bMål = self.bKampMål[:, Kamp] # Formen (bois, resultater, 2)
+        Gyldig = (Kamp >= 0) & (bMål[..., 0] >= 0) # Kampe uden bud giver NaN
+
+        self.GrupperBoisPointMatrix = np.where(Gyldig, BeregnKampPoint(bMål, Mål), np.nan) # Point af formen (bois, resultater)
+        self._Tæl('Bud scoret', Gyldig)
+
+    def _LavGrupperBoisPoint(self):
+        # Laver lister med point for hver boi ud fra pointmatricen, point som int og NaN for kampe uden bud
+        self.GrupperBoisPoint = {
+            boi: [int(bPoint) if bPoint == bPoint else np.nan for bPoint in bPointListe]
+            for boi, bPointListe in zip(self.GrupperBudBois, self.GrupperBoisPointMatrix.tolist())
+        }
 
     def _VisBoisStilling(self):
         # Viser bois stilling
-        html = f"""
+        display(HTML(self._HentHtml(('BoisStilling',), ['_BeregnBoisStilling'], self._LavBoisStillingHtml)))
+
+    def _LavBoisStillingHtml(self):
+        # Laver HTML med bois stilling
+        return f"""
         <div style="display: flex; justify-content: center;">
             {self.BoisStilling.to_html(index=False)}
         </div>
         """
-        display(HTML(html))
 
     def _BeregnGrupperStillingBois(self):
         # Beregner gruppestillinger ifølge bois samt ekstra point for gæt af gruppevinder
-        self.bStillingGrupperSamlet = {} # Definerer tom dict til samlede gruppestillinger for bois
-
-        for boi, kampe in self.GrupperBud.items():
-            self.bStillingSamlet = {} # Definerer tomme dict til hver enkelt boi
-            self.bStillingGrupper = {}
-            self.bStillingTredjepladser = {}
-
-            for gruppe, lande in self.Grupper.items(): # Fylder dict med variable for hvert land
-                for land in lande:
-                    self.bStillingSamlet[land] = {
-                    'Point': 0, 
-                    'Mål for': 0, 
-                    'Mål imod': 0, 
-                    'Målforskel': 0,
-                    'Kort': 0
-                }
-            
-            for bud in self.GrupperBud[boi]: # Beregner point fra bois' bud
-                if bud['Mål 1'] > bud['Mål 2']: # Hold 1 vinder
-                    self.bStillingSamlet[bud['Hold 1']]['Point'] += 3
-                if bud['Mål 1'] < bud['Mål 2']: # Hold 2 vinder
-                    self.bStillingSamlet[bud['Hold 2']]['Point'] += 3
-                if bud['Mål 1'] == bud['Mål 2']: # Uafgjort
-                    self.bStillingSamlet[bud['Hold 1']]['Point'] += 1
-                    self.bStillingSamlet[bud['Hold 2']]['Point'] += 1
-                
-                self.bStillingSamlet[bud['Hold 1']]['Mål for'] += bud['Mål 1'] # Beregner mål for og imod
-                self.bStillingSamlet[bud['Hold 1']]['Mål imod'] += bud['Mål 2']
-                self.bStillingSamlet[bud['Hold 2']]['Mål for'] += bud['Mål 2']
-                self.bStillingSamlet[bud['Hold 2']]['Mål imod'] += bud['Mål 1']
-
-            for land, værdier in self.bStillingSamlet.items(): # Beregner målforskel og disciplin
-                værdier['Målforskel'] = værdier['Mål for'] - værdier['Mål imod']
-                værdier['Kort'] = self.GrupperKort[land]['Gule kort'] + self.GrupperKort[land]['Røde kort']
-
-            for gruppe, lande in self.Grupper.items():
-                dict = {land: self.bStillingSamlet[land] for land in lande}
-                df = pd.DataFrame.from_dict(dict, orient='index')
-
-                self.bStillingGrupper[gruppe] = df.sort_values(
-                    by=['Point', 'Målforskel', 'Mål for', 'Kort'], 
-                    ascending=[False, False, False, True]
-                )
-
-                TredjeRække = self.bStillingGrupper[gruppe].iloc[[2]]
-                TredjeLand = TredjeRække.index[0]
-                self.bStillingTredjepladser[TredjeLand] = TredjeRække.to_dict(orient='index')[TredjeLand]
-
-                self.bStillingGrupper[gruppe] = self.bStillingGrupper[gruppe].drop('Kort', axis='columns')
-        
-            self.bStillingTredjepladser = pd.DataFrame.from_dict(self.bStillingTredjepladser, orient='index').sort_values(
-                by=['Point', 'Målforskel', 'Mål for', 'Kort'], ascending=[False, False, False, True]).drop('Kort', axis='columns')
-            
-            self.bStillingGrupperSamlet[boi] = {'Gruppestillinger': self.bStillingGrupper, 'Tredjepladser': self.bStillingTredjepladser}
-
-        self.bKorrekteGruppevindere = {}
-
-        for boi, stilling in self.bStillingGrupperSamlet.items():
-            KorrekteGrupperVindere = 0
-            for gruppe, df in stilling['Gruppestillinger'].items():
-                Vinder = self.StillingGrupper[gruppe].index[0]
-                bVinder = df.index[0]
-                if Vinder == bVinder:
-                    KorrekteGrupperVindere += 5
-            self.bKorrekteGruppevindere[boi] = KorrekteGrupperVindere
-            self.BoisStilling.loc[self.BoisStilling['Boi'] == boi, 'Point'] += self.bKorrekteGruppevindere[boi]
-        
-        self.BoisStilling = self.BoisStilling.sort_values(by='Point', ascending=False).reset_index(drop=True)
+        AntalBois = len(self.GrupperBudBois)
+        self.bStillingTabel = np.zeros((AntalBois, len(self.Hold), 3), dtype=int) # Formen (bois, hold, 3)
+        self.bPlaceringer = np.zeros((AntalBois,) + self.GruppeHold.shape, dtype=int)
+        self.bTredjepladser = np.zeros((AntalBois, len(self.GruppeHold)), dtype=int)
+
+        for start in range(0, AntalBois, BoisPrBlok): # Beregner i blokke så mellemregninger holdes små
+            Blok = slice(start, start + BoisPrBlok)
+            self.bStillingTabel[Blok] = BeregnTabel(self.GrupperBudHold[Blok], self.GrupperBudMål[Blok], len(self.Hold))
+            self.bPlaceringer[Blok], self.bTredjepladser[Blok] = RangerGrupper(self.bStillingTabel[Blok], self.GruppeHold, self.Kort)
+        self.bStillingGrupperSamlet = {} # DataFrames bygges først når de vises
+        self._Tæl('Gruppestillinger for bois', AntalBois * len(self.GruppeHold))
+
+        KorrekteGrupperVindere = self.GruppevinderBonus * (self.bPlaceringer[:, :, 0] == self.Placeringer[:, 0]).sum(axis=1)
+        self.bKorrekteGruppevindere = dict(zip(self.GrupperBudBois, KorrekteGrupperVindere.tolist()))
+
+    def _HentGrupperStillingBois(self, boi):
+        # Henter gruppestillinger og tredjepladser for en boi som DataFrames
+        if boi not in self.bStillingGrupperSamlet:
+            b = self.GrupperBudBois.index(boi)
+            bStillingGrupper, bStillingTredjepladser = self._LavStilling(
+                self.bStillingTabel[b], self.bPlaceringer[b], self.bTredjepladser[b]
+            )
+            self.bStillingGrupperSamlet[boi] = {'Gruppestillinger': bStillingGrupper, 'Tredjepladser': bStillingTredjepladser}
+
+        return self.bStillingGrupperSamlet[boi]
+
+    def _BeregnStillingDiff(self):
+        # Beregner for alle bois hvor mange pladser hvert hold er flyttet og forskellen i point og mål ift. den faktiske stilling
+        Pladser = np.tile(np.arange(self.GruppeHold.shape[1]), len(self.GruppeHold))
+
+        Placering = np.empty(len(self.Hold), dtype=int) # Holdenes plads i gruppen, den inverse af Placeringer
+        Placering[self.Placeringer.ravel()] = Pladser
+        bPlacering = np.empty((len(self.GrupperBudBois), len(self.Hold)), dtype=int)
+        np.put_along_axis(bPlacering, self.bPlaceringer.reshape(len(bPlacering), -1), Pladser[None], axis=1)
+
+        Tabel = np.concatenate([self.StillingTabel, self.StillingTabel[:, 1:2] - self.StillingTabel[:, 2:3]], axis=-1)
+        self.bStillingTabelUdvidet = np.concatenate([self.bStillingTabel, self.bStillingTabel[..., 1:2] - self.bStillingTabel[..., 2:3]], axis=-1)
+
+        # Formen (bois, hold) og (bois, hold, 4), pladser regnes fra boiens side og point og mål fra resultatets side som i visningen
+        self.bPlaceringDiff = bPlacering - Placering
+        self.bStatDiff = Tabel - self.bStillingTabelUdvidet
+
+    def _BeregnParvis(self):
+        # Sammenligner alle par af bois med matrixprodukter over kodede bud, matricerne har formen (bois, bois)
+        # ParvisUdfald og ParvisResultater tæller kampe med samme udfald og samme resultat, ParvisSving[a, b] er hvor mange point a kan hente på b
+        bMål = self.bKampMål.astype(int)
+        Gyldig = bMål[..., 0] >= 0
+        Side = bMål.max(initial=0) + 2 # Resultaterne går et mål over de højeste bud
+        Udfald = np.where(Gyldig, np.sign(bMål[..., 0] - bMål[..., 1]) + 1, -1)
+        Score = np.where(Gyldig, bMål[..., 0] * Side + bMål[..., 1], -1) # Samme rækkefølge som ScenarieGitter
+
+        Type = np.min_scalar_type(len(self.Kampe))
+        Indikator, _ = LavIndikator(Udfald, 3)
+        self.ParvisUdfald = (Indikator @ Indikator.T).astype(Type)
+        Indikator, _ = LavIndikator(Score, Side ** 2)
+        self.ParvisResultater = (Indikator @ Indikator.T).astype(Type)
+
+        # Største forspring et bud kan give over et andet i én kamp, det sidste bud er et manglende bud uden point
+        Gevinst = BeregnKampPoint(ScenarieGitter(1, Side - 1)[:, 0, None], ScenarieGitter(1, Side - 1)[None, :, 0]).astype(np.int8)
+        Gevinst = np.vstack([Gevinst, np.zeros((1, Side ** 2), dtype=np.int8)]) # Formen (bud, resultater)
+        Forspring = (Gevinst[:, None] - Gevinst[None]).max(axis=-1).astype(np.float32) # Formen (bud a, bud b)
+
+        # Summen over resterende kampe af Forspring[bud a, bud b] som ét produkt
+        Spillede, _ = FindKampe(self.GrupperResultaterHold, self.KampOpslag, self.Kampe)
+        Rest = np.setdiff1d(np.arange(len(self.Kampe)), Spillede)
+        RestScore = np.where(Score[:, Rest] >= 0, Score[:, Rest], Side ** 2)
+        Indikator, Kolonner = LavIndikator(RestScore, Side ** 2 + 1)
+        Kamp, Bud = np.divmod(Kolonner, Side ** 2 + 1)
+        self.ParvisSving = np.zeros((len(bMål), len(bMål)), dtype=np.int16)
+        for start in range(0, len(bMål), BoisPrBlok): # Forspringene fylder bois * kolonner og beregnes i blokke
+            Blok = slice(start, start + BoisPrBlok)
+            self.ParvisSving[Blok] = Forspring[RestScore[Blok][:, Kamp], Bud] @ Indikator.T
+        self._Tæl('Par af bois', len(bMål) ** 2)
+
+    def _HentParvis(self, boi):
+        # Henter en bois sammenligning med alle andre bois som DataFrame
+        b = self.GrupperBudBois.index(boi)
+        return pd.DataFrame({
+            'Samme udfald': self.ParvisUdfald[b],
+            'Samme resultat': self.ParvisResultater[b],
+            'Kan hente': self.ParvisSving[b],
+            'Kan tabe': self.ParvisSving[:, b]
+        }, index=self.GrupperBudBois).drop(index=boi)
+
+    def _LavGruppeTræfsikkerhed(self):
+        # Rangerer bois efter hvor tæt deres gruppestillinger er på de faktiske
+        Træfsikkerhed = pd.DataFrame({
+            'Placeringsfejl': np.abs(self.bPlaceringDiff).sum(axis=1),
+            'Rigtige placeringer': (self.bPlaceringDiff == 0).sum(axis=1),
+            'Pointfejl': np.abs(self.bStatDiff[..., 0]).sum(axis=1)
+        }, index=pd.Index(self.GrupperBudBois, name='Boi'))
+
+        return Træfsikkerhed.sort_values(['Placeringsfejl', 'Pointfejl'], kind='stable')
 
     def _VisGrupperStillingBois(self, boi):
         # Viser implicit gruppestilling og tredjeplads givet bois bud
-        def Formattering(s, tredjepladser):
-            formattering = []
-            for idx in range(len(s)):
-                if s.index[idx] in tredjepladser:
-                    formattering.append('background-color: rgba(0, 209, 0, 0.12)') 
-                elif idx < 1:
-                    formattering.append('background-color: rgba(0, 209, 0, 0.5)') 
-                elif 0 < idx < 2:
-                    formattering.append('background-color: rgba(0, 209, 0, 0.25)') 
-                else:
-                    formattering.append('')
-            return formattering
+        display(HTML(self._HentHtml(
+            ('GrupperStillingBois', boi), ['_BeregnGrupperStillingBois'], lambda: self._LavGrupperStillingBoisHtml(boi)
+        )))
 
-        bStillingGrupper = self.bStillingGrupperSamlet[boi]['Gruppestillinger']
-        bStillingTredjepladser = self.bStillingGrupperSamlet[boi]['Tredjepladser']
-        tredjepladser = self.bStillingGrupperSamlet[boi]['Tredjepladser'].index[:4].tolist()
-
-        html = "<div style='display: grid; grid-template-columns: repeat(3, 1fr); gap: 15px;'>"
-        for gruppe, df in bStillingGrupper.items():
-            formateret_df = df.style.apply(Formattering, axis=0, tredjepladser=tredjepladser).set_table_attributes('style="display:inline;margin:5px;"').set_caption(gruppe)
-            html += formateret_df._repr_html_()
-        html += "</div>"
+    def _LavGrupperStillingBoisHtml(self, boi):
+        # Laver HTML med implicit gruppestilling og tredjeplads givet bois bud
+        bStillingGrupperSamlet = self._HentGrupperStillingBois(boi)
+        return StilGrupper(bStillingGrupperSamlet['Gruppestillinger'], bStillingGrupperSamlet['Tredjepladser'])
 
-        html += "<div style='text-align:center; margin-top: 20px;'>"
-        formateret_tredjeplads_df = bStillingTredjepladser.style.apply(Formattering, axis=0, tredjepladser=tredjepladser).set_table_attributes('style="display:inline;margin:5px;"').set_caption('Bedste 3\'ere')
-        html += formateret_tredjeplads_df._repr_html_()
-        html += "</div>"
-
-        display(HTML(html))
-        
     def _VisGrupperStillingBoisDiff(self, boi):
         # Viser tabeller med differencer
-        def BeregnPlaceringDiff(Hold1, Hold2):
-            faktisk_placering = {land: idx for idx, land in enumerate(Hold2)}
-
-            diff_liste = []
-
-            for idx, land in enumerate(Hold1):
-                placering_diff = idx - faktisk_placering[land]
-                diff_liste.append(f'{land} ({placering_diff:+d})')
-
-            return diff_liste
-        
-        def LavDiff(x, y):
-            if x > y:
-                return f'{x} (-{x - y})'
-            elif x < y: 
-                return f'{x} (+{y - x})'
-            else:
-                return f'{x} (+0)'
-        
+        display(HTML(DiffStil + self._HentHtml(
+            ('GrupperStillingBoisDiff', boi), ['_BeregnStillingDiff'], lambda: self._LavGrupperStillingBoisDiffHtml(boi)
+        )))
+
+    def _LavGrupperStillingBoisDiffHtml(self, boi):
+        # Laver tabeller med differencer uden stylesheet, som deles af alle bois
+        b = self.GrupperBudBois.index(boi)
         bStillingGrupperSamletDiff = {}
 
-        for gruppe, stilling in self.bStillingGrupperSamlet[boi]['Gruppestillinger'].items():
-            bStillingGrupperDiff = {}
-            
-            bRækkefølge = list(stilling.index) # Laver ny tekst til hold afhængig af placering ift. resultat
-            Rækkefølge = list(self.StillingGrupper[gruppe].index)
-            NyeLande = BeregnPlaceringDiff(bRækkefølge, Rækkefølge)
+        # Teksterne laves først her ud fra de beregnede differencer, i rækkefølgen ifølge boien
+        for g, gruppe in enumerate(self.Grupper):
+            Lande = self.bPlaceringer[b, g]
+            Værdier = self.bStillingTabelUdvidet[b, Lande]
+            Diff = self.bStatDiff[b, Lande]
 
-            for idx, land in enumerate(bRækkefølge):
-                bud = stilling.loc[land]
-                resultat = self.StillingGrupper[gruppe].loc[land]
-                
-                NyePoint, NyeMålFor, NyeMålImod, NyMålforskel = [LavDiff(bud[i], resultat[i]) for i in range(len(bud))]
-                NyeVærdier = {
-                    'Point': NyePoint, 
-                    'Mål for': NyeMålFor, 
-                    'Mål imod': NyeMålImod, 
-                    'Målforskel': NyMålforskel
-                }
-                bStillingGrupperDiff[NyeLande[idx]] = NyeVærdier
-            
-            bStillingGrupperSamletDiff[gruppe] = bStillingGrupperDiff
+            bStillingGrupperSamletDiff[gruppe] = pd.DataFrame({
+                kolonne: [f'{x} ({d:+d})' for x, d in zip(Værdier[:, k], Diff[:, k])]
+                for k, kolonne in enumerate(['Point', 'Mål for', 'Mål imod', 'Målforskel'])
+            }, index=[f'{self.Hold[h]} ({d:+d})' for h, d in zip(Lande, self.bPlaceringDiff[b, Lande])])
 
-        for gruppe, stilling in bStillingGrupperSamletDiff.items():
-            bStillingGrupperSamletDiff[gruppe] = pd.DataFrame.from_dict(stilling, orient='index')
-        
         html = f"""
-        <style>
-            .bois-dataframe {{
-                font-size: 10px;
-            }}
-            .bois-dataframe thead th {{
-                text-align: center;
-                font-size: 12px;
-            }}
-            .bois-dataframe tbody td {{
-                text-align: center;
-            }}
-            .bois-dataframe thead th:nth-child(1), .bois-dataframe tbody td:nth-child(1) {{
-                width: 150px;
-            }}
-            .bois-dataframe thead th:nth-child(2), .bois-dataframe tbody td:nth-child(2) {{
-                width: 100px;
-            }}
-            .bois-dataframe thead th:nth-child(3), .bois-dataframe tbody td:nth-child(3) {{
-                width: 100px;
-            }}
-            .bois-dataframe thead th:nth-child(4), .bois-dataframe tbody td:nth-child(4) {{
-                width: 100px;
-            }}
-            .bois-dataframe thead th:nth-child(5), .bois-dataframe tbody td:nth-child(5) {{
-                width: 100px;
-            }}
-        </style>
         <div style='display: flex; justify-content: center; font-size: 16px; margin-bottom: 10px; margin-top: 30px'>
             <strong>{boi}</strong>
         </div>
@@ -425,14 +1559,14 @@ class TBTFEuro:
         for gruppe, df in bStillingGrupperSamletDiff.items():
             html += df.to_html(classes='bois-dataframe', index=True, header=True, table_id=gruppe, border=0)
         html += "</div>"
-        
-        display(HTML(html))
+
+        return html
 
     def _ImporterSlutspilResultater(self):
         # Importerer resultater i slutspillet
-        SlutspilFil = 'Slutspil.xlsx'
+        SlutspilFil = os.path.join(self.Mappe, self.Filer['Slutspil'])
 
-        self.SlutspilResultater = pd.read_excel( # Indlæser slutspilsfil
+        self.SlutspilResultater = LæsExcel( # Indlæser slutspilsfil
             SlutspilFil,
             header=0,
             names=['Hold 1', 'Hold 2', 'Mål 1', 'Mål 2', 'Forlænget 1', 'Forlænget 2', 'Straffe 1', 'Straffe 2']
@@ -444,61 +1578,47 @@ class TBTFEuro:
 
         self.SlutspilResultater = self.SlutspilResultater.to_dict(orient='records') # Konverterer til dict
 
-    def _BestemSlutspil(self):
-        # Bestemmer udfald af slutspil ud fra hidtige resultater
-        self.Kvartfinalister = []
-        self.Semifinalister = []
-        self.Finalister = []
-        self.Vinder = []
-
-        k = 1
-
-        for kamp in self.SlutspilResultater:
-            Hold1 = kamp['Hold 1']
-            Hold2 = kamp['Hold 2']
-
-            MålHold1 = (
-                (kamp['Mål 1'] if not pd.isna(kamp['Mål 1']) else 0) +
-                (kamp['Forlænget 1'] if not pd.isna(kamp['Forlænget 1']) else 0) +
-                (kamp['Straffe 1'] if not pd.isna(kamp['Straffe 1']) else 0)
-            )
-            MålHold2 = (
-                (kamp['Mål 2'] if not pd.isna(kamp['Mål 2']) else 0) +
-                (kamp['Forlænget 2'] if not pd.isna(kamp['Forlænget 2']) else 0) +
-                (kamp['Straffe 2'] if not pd.isna(kamp['Straffe 2']) else 0)
-            )
+    def _BestemOttendedelsfinaler(self):
+        # Bestemmer ottendedelsfinalerne fra Slutspil.xlsx, eller ud fra gruppestillingen når gruppespillet er slut
+        if len(self.SlutspilResultater) >= 8:
+            self.Ottendedelsfinaler = [(kamp['Hold 1'], kamp['Hold 2']) for kamp in self.SlutspilResultater[:8]]
+            return
 
-            if MålHold1 > MålHold2:
-                Vinder = Hold1
-            elif MålHold1 < MålHold2:
-                Vinder = Hold2
-            else:
-                Vinder = np.nan
-
-            if k < 9:
-                self.Kvartfinalister.append(Vinder)
-            elif k < 13:
-                self.Semifinalister.append(Vinder)
-            elif k < 15:
-                self.Finalister.append(Vinder)
-            else:
-                self.Vinder.append(Vinder)
+        Spillede, _ = FindKampe(self.GrupperResultaterHold, self.KampOpslag, self.Kampe)
+        if self.GruppeHold.shape == (6, 4) and np.isin(np.arange(len(self.Kampe)), Spillede).all(): # Tabellen over treere gælder EM-formatet
+            Par = BestemOttendedelsfinaler(self.Placeringer, self.Tredjepladser)
+            self.Ottendedelsfinaler = [(self.Hold[Hold1], self.Hold[Hold2]) for Hold1, Hold2 in Par]
+        else:
+            self.Ottendedelsfinaler = [] # Programmet kendes ikke før gruppespillet er slut
 
-            k += 1
+    def _BestemSlutspil(self):
+        # Bestemmer udfald af slutspil ud fra hidtige resultater
+        # Kampene placeres efter holdene i programmet, så rækkefølgen i Slutspil.xlsx kun betyder noget for ottendedelsfinalerne
+        self.SlutspilPladser, Vindere = PlacerSlutspilKampe(self.SlutspilResultater, self.Ottendedelsfinaler)
+        self.Kvartfinalister = Vindere[:8]
+        self.Semifinalister = Vindere[8:12]
+        self.Finalister = Vindere[12:14]
+        self.Vinder = Vindere[14:]
 
-        Ottendedelsfinalister = set()
+        Ottendedelsfinalister = set(hold for kamp in self.Ottendedelsfinaler for hold in kamp)
 
         for kamp in self.SlutspilResultater:
             Ottendedelsfinalister.add(kamp['Hold 1'])
             Ottendedelsfinalister.add(kamp['Hold 2'])
 
         self.Ottendedelsfinalister = list(Ottendedelsfinalister)
+
+        # Hvilke hold der har nået hver runde som bitmasker
+        self.SlutspilMasker = np.array([
+            LavHoldMaske(Lande, self.HoldIndeks)
+            for Lande in [self.Ottendedelsfinalister, self.Kvartfinalister, self.Semifinalister, self.Finalister, self.Vinder]
+        ], dtype=MaskeType(len(self.Hold)))
                 
     def _ImporterSlutspilBud(self):
         # Importer bois bud på slutspil
-        SlutspilBudFil = 'SlutspilBud.xlsx'
+        SlutspilBudFil = os.path.join(self.Mappe, self.Filer['SlutspilBud'])
 
-        self.SlutspilBud = pd.read_excel(
+        self.SlutspilBud = LæsExcel(
             SlutspilBudFil,
             sheet_name=None,
             header=None,
@@ -547,44 +1667,700 @@ class TBTFEuro:
                 'Vinder':Vinder
             }
 
+        # Buddene som masker af formen (bois, runder), hvor hver runde har én bit pr. hold
+        self.SlutspilBudBois = list(self.SlutspilBudRunder)
+        self.SlutspilBudMasker = np.array([
+            [LavHoldMaske(Lande, self.HoldIndeks) for Lande in Runder.values()] for Runder in self.SlutspilBudRunder.values()
+        ], dtype=MaskeType(len(self.Hold))).reshape(len(self.SlutspilBudBois), len(SlutspilRunder))
+
     def _BeregnSlutspilBois(self):
-        # Beregner point for slutspil for bois
-        self.SlutspilBoisPoint = {boi: [] for boi in self.SlutspilBudRunder.keys()}
-        
-        for boi, værdier in self.SlutspilBudRunder.items():
-            bOttendedelsfinalister = set(værdier['Ottendedelsfinalister']) # Point for ottendedelsfinalister
-            Ottendedelsfinalister = set(self.Ottendedelsfinalister)
-            KorrekteOttendedelsfinalister = bOttendedelsfinalister.intersection(Ottendedelsfinalister)
-            self.SlutspilBoisPoint[boi].append(len(KorrekteOttendedelsfinalister) * 4)
+        # Beregner point for slutspil for alle bois på én gang ved at tælle fælles bits i bud og faktiske runder
+        Korrekte = TælBits(self.SlutspilBudMasker & self.SlutspilMasker).astype(int) # Formen (bois, runder)
+        self.SlutspilBoisPointMatrix = Korrekte * np.array(list(self.SlutspilRunder.values()))
+        self.SlutspilBoisPoint = dict(zip(self.SlutspilBudBois, self.SlutspilBoisPointMatrix.tolist()))
+
+    def _HentSlutspilPoint(self):
+        # Henter slutspilspoint i samme rækkefølge som GrupperBudBois, bois uden slutspilsbud får 0 point
+        Indeks = pd.Index(self.SlutspilBudBois).get_indexer(self.GrupperBudBois)
+        return np.where(Indeks >= 0, self.SlutspilBoisPointMatrix.sum(axis=1)[Indeks], 0)
+
+    def _BeregnBoisStilling(self):
+        # Beregner samlet stilling for bois med point fra gruppespil, gruppevindere og slutspil
+        GrupperPoint = np.nansum(self.GrupperBoisPointMatrix, axis=1).astype(int)
+        BonusPoint = np.array([self.bKorrekteGruppevindere[boi] for boi in self.GrupperBudBois], dtype=int)
+        SlutspilPoint = self._HentSlutspilPoint()
+
+        # Lige point afgøres af stillingen efter gruppevinderne og derefter efter gruppespillet
+        Point = GrupperPoint + BonusPoint + SlutspilPoint
+        Rækkefølge = np.lexsort((np.arange(len(Point)), -GrupperPoint, -(GrupperPoint + BonusPoint), -Point))
+
+        self.BoisStilling = pd.DataFrame({
+            'Boi': np.array(self.GrupperBudBois, dtype=object)[Rækkefølge],
+            'Point': Point[Rækkefølge]
+        })
+
+    def _BeregnTidslinje(self, KunAfsluttedeGrupper=True):
+        # Beregner stillingen for bois efter hver kamp med kumulative summer, først gruppekampene og så slutspillets kampe
+        # Bonus for gruppevindere tæller når gruppen er færdigspillet, eller for den førende med KunAfsluttedeGrupper=False
+        AntalHold = len(self.Hold)
+        AntalBois = len(self.GrupperBudBois)
+
+        # Gruppespil: point for hver kamp og stillingen i grupperne efter hver kamp
+        GrupperPoint = np.nan_to_num(self.GrupperBoisPointMatrix.T).astype(int).cumsum(axis=0) # Formen (kampe, bois)
+        Tabeller = BeregnTabel(self.GrupperResultaterHold[:, None], self.GrupperResultaterMål[:, None], AntalHold).cumsum(axis=0)
+        Placeringer, _ = RangerGrupper(Tabeller, self.GruppeHold, self.Kort)
+        Korrekte = self.bPlaceringer[None, :, :, 0] == Placeringer[:, None, :, 0] # Formen (kampe, bois, grupper)
+
+        if KunAfsluttedeGrupper:
+            Kamp, _ = FindKampe(self.GrupperResultaterHold, self.KampOpslag, self.Kampe)
+            Spillet = np.zeros((len(Kamp), len(self.Kampe)), dtype=bool)
+            Spillet[np.flatnonzero(Kamp >= 0), Kamp[Kamp >= 0]] = True
+            Spillet = np.logical_or.accumulate(Spillet, axis=0)
+            Afsluttet = np.stack([Spillet[:, np.isin(self.Kampe[:, 0], Gruppe)].all(axis=1) for Gruppe in self.GruppeHold], axis=-1)
+            Korrekte &= Afsluttet[:, None, :]
+        BonusPoint = self.GruppevinderBonus * Korrekte.sum(axis=-1)
+
+        # Slutspil: ottendedelsfinalisterne tæller fra sidste gruppekamp, de næste runder fra kampen holdet vinder
+        Indeks = pd.Index(self.SlutspilBudBois).get_indexer(self.GrupperBudBois)
+        Masker = np.where(Indeks[:, None] >= 0, self.SlutspilBudMasker[Indeks], 0).astype(self.SlutspilBudMasker.dtype)
+        Vægte = np.array(list(self.SlutspilRunder.values()))
+
+        Vindere = self.Kvartfinalister + self.Semifinalister + self.Finalister + self.Vinder # Efter plads i programmet
+        PladsRunde = np.repeat([1, 2, 3, 4], [8, 4, 2, 1])
+        Kampe = [
+            (kamp, PladsRunde[Plads], self.HoldIndeks[Vindere[Plads]])
+            for kamp, Plads in zip(self.SlutspilResultater, self.SlutspilPladser)
+            if Plads is not None and Vindere[Plads] in self.HoldIndeks # Kampe uden vinder eller plads tæller ikke
+        ]
+        Runder = np.array([Runde for _, Runde, _ in Kampe], dtype=int)
+        Hold = np.array([Hold for _, _, Hold in Kampe], dtype=Masker.dtype)
+        SlutspilPoint = (Vægte[Runder] * ((Masker[:, Runder] >> Hold) & 1)).T.cumsum(axis=0) # Formen (kampe, bois)
+
+        # Samlet stilling, gruppespillets point står stille under slutspillet
+        AntalGruppe, AntalSlutspil = len(GrupperPoint), len(SlutspilPoint)
+        Række = np.minimum(np.arange(AntalGruppe + AntalSlutspil) + 1, AntalGruppe) # Gruppespillets række efter hver kamp, 0 er før første kamp
+        GrupperPoint = np.vstack([np.zeros(AntalBois, dtype=int), GrupperPoint])[Række]
+        BonusPoint = np.vstack([np.zeros(AntalBois, dtype=int), BonusPoint])[Række]
+        Point = GrupperPoint + BonusPoint
+        Point[max(AntalGruppe - 1, 0):] += Vægte[0] * TælBits(Masker[:, 0] & self.SlutspilMasker[0]).astype(int)
+        Point[AntalGruppe:] += SlutspilPoint
+
+        # Placeringer med samme regler for lige point som BoisStilling
+        Rækkefølge = np.lexsort((np.broadcast_to(np.arange(AntalBois), Point.shape), -GrupperPoint, -(GrupperPoint + BonusPoint), -Point))
+        self.TidslinjePlacering = np.empty(Point.shape, dtype=np.min_scalar_type(AntalBois))
+        np.put_along_axis(self.TidslinjePlacering, Rækkefølge, np.arange(1, AntalBois + 1), axis=-1)
+
+        self.TidslinjePoint = Point
+        self.TidslinjeKampe = [f"{kamp['Hold 1']}-{kamp['Hold 2']}" for kamp in self.GrupperResultater + [kamp for kamp, _, _ in Kampe]]
+
+        return self.TidslinjePlacering
+
+    def _VisTidslinje(self, KunAfsluttedeGrupper=True):
+        # Tegner bois placering efter hver kamp
+        Placering = self._BeregnTidslinje(KunAfsluttedeGrupper)
+
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ax.plot(np.arange(1, len(Placering) + 1), Placering, marker='.')
+        ax.invert_yaxis() # Førstepladsen øverst
+        ax.set_xlabel('Kamp')
+        ax.set_ylabel('Placering')
+        ax.legend(self.GrupperBudBois, loc='center left', bbox_to_anchor=(1, 0.5))
+        plt.show()
+
+    def _TilføjGrupperResultat(self, Hold1, Hold2, Mål1, Mål2):
+        # Tilføjer et resultat fra gruppespillet og opdaterer kun det kampen påvirker
+        self._Kør('_BeregnGrupperBois') # Sikrer at trinnene findes før de opdateres
+        self._Kør('_BeregnGrupperStillingBois')
+
+        self.GrupperResultater.append({'Hold 1': Hold1, 'Hold 2': Hold2, 'Mål 1': Mål1, 'Mål 2': Mål2})
+
+        Hold = np.array([self.HoldIndeks[Hold1], self.HoldIndeks[Hold2]])
+        Mål = np.array([Mål1, Mål2])
+        self.GrupperResultaterHold = np.vstack([self.GrupperResultaterHold, Hold])
+        self.GrupperResultaterMål = np.vstack([self.GrupperResultaterMål, Mål])
+
+        # Point for bois' bud på kampen, som slås op i indekset over kampe
+        Kamp, Vendt = FindKampe(Hold, self.KampOpslag, self.Kampe)
+        bMål = self.bKampMål[:, Kamp]
+        Gyldig = (Kamp >= 0) & (bMål[:, 0] >= 0)
+
+        KampPoint = np.where(Gyldig, BeregnKampPoint(bMål, Mål[::-1] if Vendt else Mål), np.nan)
+        self._Tæl('Bud scoret', Gyldig)
+        self.GrupperBoisPointMatrix = np.column_stack([self.GrupperBoisPointMatrix, KampPoint])
+        self._Nulstil('_LavGrupperBoisPoint')
+
+        # Stillingen for de to hold, placeringer i deres gruppe og rækkefølgen af tredjepladser
+        self.StillingTabel += BeregnTabel(Hold, Mål[None], len(self.Hold))
+
+        g = np.flatnonzero((self.GruppeHold == Hold[0]).any(axis=1))[0]
+        GammelVinder = self.Placeringer[g, 0]
+        Gruppe = self.GruppeHold[g]
+        self.Placeringer[g] = Gruppe[Rangorden(self.StillingTabel[Gruppe], self.Kort[Gruppe])]
+
+        Treere = self.Placeringer[:, 2]
+        self.Tredjepladser = Treere[Rangorden(self.StillingTabel[Treere], self.Kort[Treere])]
+
+        # Bonus for gruppevinderen ændres kun hvis gruppen har fået ny vinder
+        if self.Placeringer[g, 0] != GammelVinder:
+            bVindere = self.bPlaceringer[:, g, 0]
+            Bonus = self.GruppevinderBonus * ((bVindere == self.Placeringer[g, 0]).astype(int) - (bVindere == GammelVinder))
+            for b in np.flatnonzero(Bonus):
+                self.bKorrekteGruppevindere[self.GrupperBudBois[b]] += Bonus[b].item()
+
+        self._Nulstil('_LavGrupperStilling') # Tabeller og samlet stilling laves igen når de vises
+        self._Nulstil('_BeregnStillingDiff')
+        self._Nulstil('_BeregnParvis') # Kampen er ikke længere til rest
+        self._Nulstil('_BestemOttendedelsfinaler') # Sidste gruppekamp kan fastlægge programmet
+        self._Nulstil('_BeregnBoisStilling')
+
+    def _TilføjSlutspilResultat(self, Hold1, Hold2, Mål1, Mål2, Forlænget1=np.nan, Forlænget2=np.nan, Straffe1=np.nan, Straffe2=np.nan):
+        # Tilføjer et resultat fra slutspillet og genberegner kun slutspilspoint
+        self._Kør('_BestemOttendedelsfinaler')
+
+        Resultat = {
+            'Hold 1': Hold1, 'Hold 2': Hold2,
+            'Mål 1': Mål1, 'Mål 2': Mål2,
+            'Forlænget 1': Forlænget1, 'Forlænget 2': Forlænget2,
+            'Straffe 1': Straffe1, 'Straffe 2': Straffe2
+        }
+
+        # Et udledt program skrives ind som ottendedelsfinalernes rækker, så resultaterne udfylder deres egen række
+        if len(self.SlutspilResultater) < 8 and self.Ottendedelsfinaler:
+            Pladser, _ = PlacerSlutspilKampe(self.SlutspilResultater, self.Ottendedelsfinaler)
+            Rækker = [dict.fromkeys(Resultat, np.nan) | {'Hold 1': Par[0], 'Hold 2': Par[1]} for Par in self.Ottendedelsfinaler]
+            for kamp, Plads in sorted(zip(self.SlutspilResultater, Pladser), key=lambda x: 15 if x[1] is None else x[1]):
+                if Plads is not None and Plads < 8:
+                    Rækker[Plads] = kamp
+                else:
+                    Rækker.append(kamp)
+            self.SlutspilResultater[:] = Rækker
 
-            bKvartfinalister = set(værdier['Kvartfinalister']) # Point for kvartfinalister
-            Kvartfinalister = set(self.Kvartfinalister)
-            KorrekteKvartfinalister = bKvartfinalister.intersection(Kvartfinalister)
-            self.SlutspilBoisPoint[boi].append(len(KorrekteKvartfinalister) * 6)
+        for kamp in self.SlutspilResultater: # Udfylder kampen hvis den allerede står i programmet
+            if {kamp['Hold 1'], kamp['Hold 2']} == {Hold1, Hold2} and pd.isna(kamp['Mål 1']):
+                kamp.update(Resultat)
+                break
+        else:
+            with warnings.catch_warnings(record=True) as Advarsler: # Et nyt resultat skal stå i programmet når det kendes
+                warnings.simplefilter('always')
+                PlacerSlutspilKampe(self.SlutspilResultater + [Resultat], self.Ottendedelsfinaler)
+            if any(f"{Hold1} - {Hold2} er ikke" in str(Advarsel.message) for Advarsel in Advarsler):
+                raise ValueError(f"{Hold1} - {Hold2} er ikke en kamp i slutspillets program")
+            self.SlutspilResultater.append(Resultat)
 
-            bSemifinalister = set(værdier['Semifinalister']) # Point for semifinalister
-            Semifinalister = set(self.Semifinalister)
-            KorrekteSemifinalister = bSemifinalister.intersection(Semifinalister)
-            self.SlutspilBoisPoint[boi].append(len(KorrekteSemifinalister) * 8)
+        self._Nulstil('_BestemOttendedelsfinaler') # Programmet, slutspilspoint og samlet stilling følger med
 
-            bFinalister = set(værdier['Finalister']) # Point for finalister
-            Finalister = set(self.Finalister)
-            KorrekteFinalister = bFinalister.intersection(Finalister)
-            self.SlutspilBoisPoint[boi].append(len(KorrekteFinalister) * 10)
 
-            bVinder = set(værdier['Vinder']) # Point for vinder
-            Vinder = set(self.Vinder)
-            KorrektVinder = bVinder.intersection(Vinder)
-            self.SlutspilBoisPoint[boi].append(len(KorrektVinder) * 15)
 
-            self.BoisStilling.loc[self.BoisStilling['Boi'] == boi, 'Point'] += sum(self.SlutspilBoisPoint[boi])
-        
-        self.BoisStilling = self.BoisStilling.sort_values(by='Point', ascending=False).reset_index(drop=True)
 
 
+            
 
+    def _LavSimuleringsModel(self):
+        # Samler faste resultater, resterende kampe, bud og Poisson-model for hvert hold til simulering
+        AntalHold = len(self.Hold)
+
+        # Målmodel: angrebs- og forsvarsstyrke ud fra gruppespillet, trukket mod gennemsnittet
+        Hold = self.GrupperResultaterHold[(self.GrupperResultaterHold >= 0).all(axis=1)]
+        AntalKampe = np.bincount(Hold.ravel(), minlength=AntalHold)
+        MålFor, MålImod = self.StillingTabel[:, 1], self.StillingTabel[:, 2]
+        μ = MålFor.sum() / AntalKampe.sum() if MålFor.sum() > 0 else 1.3
+        Vægt = 2
+
+        # Resterende gruppekampe og bois' bud på dem fra indekset over kampe
+        Spillede, _ = FindKampe(self.GrupperResultaterHold, self.KampOpslag, self.Kampe)
+        Rest = np.setdiff1d(np.arange(len(self.Kampe)), Spillede)
+        RestHold = self.Kampe[Rest]
+        bRestMål = self.bKampMål[:, Rest]
+        bRestGyldig = bRestMål[..., 0] >= 0
+
+        # Bois' bud på slutspillet som 0/1 pr. runde og hold, pakket ud af maskerne
+        Indeks = pd.Index(self.SlutspilBudBois).get_indexer(self.GrupperBudBois)
+        Masker = np.where(Indeks[:, None] >= 0, self.SlutspilBudMasker[Indeks], 0).astype(self.SlutspilBudMasker.dtype)
+        bRunder = ((Masker[..., None] >> np.arange(AntalHold, dtype=Masker.dtype)) & 1).astype(np.float32)
+
+        # Slutspillets program og kendte vindere
+        Vindere = self.Kvartfinalister + self.Semifinalister + self.Finalister + self.Vinder
+        SlutspilVindere = np.full(15, -1, dtype=int)
+        SlutspilVindere[:len(Vindere)] = [self.HoldIndeks.get(land, -1) for land in Vindere]
+
+        Ottendedelsfinaler = None
+        if len(RestHold) == 0 and len(self.Ottendedelsfinaler):
+            Ottendedelsfinaler = np.array([[self.HoldIndeks[Hold1], self.HoldIndeks[Hold2]] for Hold1, Hold2 in self.Ottendedelsfinaler])
+
+        return {
+            'μ': μ,
+            'Angreb': (MålFor + Vægt * μ) / (AntalKampe + Vægt) / μ,
+            'Forsvar': (MålImod + Vægt * μ) / (AntalKampe + Vægt) / μ,
+            'StillingTabel': self.StillingTabel,
+            'GruppeHold': self.GruppeHold,
+            'Kort': self.Kort,
+            'Placeringer': self.Placeringer,
+            'Tredjepladser': self.Tredjepladser,
+            'RestHold': RestHold,
+            'FastePoint': np.nansum(self.GrupperBoisPointMatrix, axis=1).astype(int),
+            'bRestMål': bRestMål,
+            'bRestGyldig': bRestGyldig,
+            'bVindere': self.bPlaceringer[:, :, 0],
+            'bRunder': bRunder,
+            'Ottendedelsfinaler': Ottendedelsfinaler,
+            'SlutspilVindere': SlutspilVindere,
+            'SlutspilVægte': np.array(list(self.SlutspilRunder.values())),
+            'Bonus': self.GruppevinderBonus
+        }
 
+    def _SimulerTurnering(self, AntalTurneringer=100000, Frø=2024, BatchStørrelse=10000, AntalProcesser=None):
+        # Simulerer resten af turneringen og beregner sandsynligheden for hver placering for bois
+        Model = self._LavSimuleringsModel()
+
+        Batcher = [min(BatchStørrelse, AntalTurneringer - start) for start in range(0, AntalTurneringer, BatchStørrelse)]
+        Frø = np.random.SeedSequence(Frø).spawn(len(Batcher)) # Samme frø giver samme resultat uanset antal processer
+
+        if AntalProcesser == 1:
+            Tællinger = list(map(SimulerTurneringer, repeat(Model), Batcher, Frø))
+        else:
+            with ProcessPoolExecutor(AntalProcesser) as pulje:
+                Tællinger = list(pulje.map(SimulerTurneringer, repeat(Model), Batcher, Frø))
+
+        self.SimuleretPlacering = pd.DataFrame(
+            sum(Tællinger) / AntalTurneringer,
+            index=self.GrupperBudBois,
+            columns=range(1, len(self.GrupperBudBois) + 1)
+        ).reindex(self.BoisStilling['Boi'])
+
+        return self.SimuleretPlacering
+
+    def _BeregnMuligePlaceringer(self, MaksMål=None, AntalProcesser=None, SlutspilBudget=2**32):
+        # Finder eksakt hver bois bedste og værste mulige placering, og om de stadig kan vinde
+        # Før programmet er kendt gennemregnes slutspillet samlet for hvert udledt program, og SlutspilBudget begrænser hvor
+        # mange sammenligninger det må koste i hver proces. Rækker budgettet ikke, er de placeringer der ikke er bevist NaN
+        Model = self._LavSimuleringsModel()
+        Model['SlutspilBudget'] = SlutspilBudget
+        AntalBois = len(self.GrupperBudBois)
+        # Resultater over MaksMål prøves ikke, så målforskel og scorede mål kan kun skille hold inden for loftet. En gruppe
+        # der kun kan afgøres af en større sejr, regnes ikke med. Med mange resterende kampe skal MaksMål sættes ned
+        if MaksMål is None: # Alle bud skal kunne ramme præcist, og et mål mere end højeste bud skal kunne skille dem
+            MaksMål = max(4, int(self.bKampMål.max()) + 1)
+
+        # Bonus for afsluttede grupper ligger fast, de øvrige grupper opregnes hver for sig
+        ResterendeGrupper = [g for g, lande in enumerate(self.GruppeHold) if np.isin(Model['RestHold'], lande).any()]
+        Afsluttede = np.setdiff1d(np.arange(len(self.GruppeHold)), ResterendeGrupper)
+        Model['FastePoint'] = Model['FastePoint'] + Model['Bonus'] * (Model['bVindere'][:, Afsluttede] == self.Placeringer[Afsluttede, 0]).sum(axis=1)
+
+        Blokke = [LavGruppeUdfald(Model, g, MaksMål) for g in ResterendeGrupper]
+        if Model['Ottendedelsfinaler'] is not None:
+            Blokke.append(LavSlutspilUdfald(Model))
+            Model['SlutspilParvis'] = np.zeros((AntalBois, AntalBois), dtype=int)
+        else: # Uden program begrænses slutspillet parvis over alle programmer
+            Model['SlutspilParvis'] = SlutspilParvisMaks(Model)
+        if not Blokke:
+            Blokke.append({'Gruppe': None, 'Point': np.zeros((1, AntalBois), dtype=int)})
+
+        # Søgningen starter fra opnåelige placeringer, og første bloks udfald deles ud på processerne
+        Bedste, Værste = StartPlaceringer(Model, Blokke)
+        Dele = np.array_split(np.arange(len(Blokke[0]['Point'])), min(len(Blokke[0]['Point']), 4 * (AntalProcesser or os.cpu_count())))
+        if AntalProcesser == 1 or len(Dele) == 1:
+            for Del in Dele: # Hver del beskærer med det de foregående har fundet
+                Bedste, Værste, Afbrudt = SøgPlaceringer(Model, Blokke, Del, Bedste, Værste)
+        else:
+            Model.pop('SlutspilCache', None) # Hver proces bygger sine egne veje i stedet for at få dem sendt med
+            with ProcessPoolExecutor(AntalProcesser) as pulje:
+                Resultater = list(pulje.map(SøgPlaceringer, repeat(Model), repeat(Blokke), Dele, repeat(Bedste), repeat(Værste)))
+            Bedste = np.min([Bedste for Bedste, _, _ in Resultater], axis=0)
+            Værste = np.max([Værste for _, Værste, _ in Resultater], axis=0)
+            Afbrudt = any(Afbrudt for _, _, Afbrudt in Resultater)
+
+        # Efter en afbrudt søgning er kun første- og sidstepladser sikre, de andre placeringer er opnåelige men ikke bevist
+        BedsteSikker, VærsteSikker = (Bedste == 0) | (not Afbrudt), (Værste == AntalBois - 1) | (not Afbrudt)
+        self.MuligePlaceringer = pd.DataFrame({
+            'Bedste placering': pd.Series(Bedste + 1).where(BedsteSikker),
+            'Værste placering': pd.Series(Værste + 1).where(VærsteSikker),
+            'Kan vinde': pd.Series(Bedste == 0).where(BedsteSikker)
+        }).set_axis(self.GrupperBudBois).reindex(self.BoisStilling['Boi'])
+        self.MuligePlaceringer.attrs['Eksakt'] = not Afbrudt
+        self.MuligePlaceringer.attrs['MaksMål'] = MaksMål # Resultater med flere mål i en kamp er ikke prøvet
+
+        return self.MuligePlaceringer
+
+    def _BeregnScenarier(self, Kampe, Mål):
+        # Beregner den samlede stilling for bois i hvert scenarie for resterende gruppekampe, Mål har formen (scenarier, kampe, 2)
+        Model = self._LavSimuleringsModel()
+        Mål = np.asarray(Mål)
+        AntalScenarier = len(Mål)
+        AntalBois = len(self.GrupperBudBois)
+
+        # Kampene slås op blandt de resterende kampe, vendte kampe får målene byttet om
+        Hold = np.array([[self.HoldIndeks[Hold1], self.HoldIndeks[Hold2]] for Hold1, Hold2 in Kampe]).reshape(-1, 2)
+        Kamp, Vendt = FindKampe(Hold, self.KampOpslag, self.Kampe)
+        Rest, _ = FindKampe(Model['RestHold'], self.KampOpslag, self.Kampe)
+        if not np.isin(Kamp, Rest).all():
+            raise ValueError('Scenarier kan kun indeholde resterende gruppekampe')
+
+        RestNummer = np.searchsorted(Rest, Kamp)
+        Mål = np.where(Vendt[:, None], Mål[..., ::-1], Mål)
+        Hold = Model['RestHold'][RestNummer]
+
+        GrupperPoint = np.repeat(Model['FastePoint'][None], AntalScenarier, axis=0)
+        Placeringer = np.repeat(Model['Placeringer'][None], AntalScenarier, axis=0)
+        Tabel = np.repeat(Model['StillingTabel'][None], AntalScenarier, axis=0)
+
+        # Hvert forskelligt udfald i en gruppe beregnes én gang og deles af alle scenarier med det udfald
+        for g, Gruppe in enumerate(self.GruppeHold):
+            IGruppe = np.flatnonzero(np.isin(Hold[:, 0], Gruppe))
+            if not len(IGruppe):
+                continue
+
+            Udfald, Scenarie = np.unique(Mål[:, IGruppe].reshape(AntalScenarier, -1), axis=0, return_inverse=True)
+            Udfald = Udfald.reshape(len(Udfald), len(IGruppe), 2)
+            Scenarie = Scenarie.ravel()
+
+            UdfaldTabel = Model['StillingTabel'][Gruppe] + BeregnTabel(Hold[IGruppe], Udfald, len(self.Hold))[:, Gruppe]
+            UdfaldPlacering = Gruppe[Rangorden(UdfaldTabel, self.Kort[Gruppe])]
+
+            bMål = Model['bRestMål'][:, RestNummer[IGruppe]]
+            UdfaldPoint = (BeregnKampPoint(bMål, Udfald[:, None]) * (bMål[..., 0] >= 0)).sum(axis=-1)
+
+            GrupperPoint += UdfaldPoint[Scenarie]
+            Placeringer[:, g] = UdfaldPlacering[Scenarie]
+            Tabel[:, Gruppe] = UdfaldTabel[Scenarie]
+
+        BonusPoint = Model['Bonus'] * (Model['bVindere'] == Placeringer[:, None, :, 0]).sum(axis=-1)
+
+        # Ottendedelsfinalisterne udledes af gruppestillingen, når scenariet afslutter gruppespillet før programmet kendes
+        SlutspilPoint = np.repeat(self._HentSlutspilPoint()[None], AntalScenarier, axis=0)
+        if len(self.SlutspilResultater) < 8 and len(Kamp) == len(Rest) and len(np.unique(Kamp)) == len(Rest):
+            Treere = Placeringer[..., 2]
+            TreerTabel = np.take_along_axis(Tabel, Treere[..., None], axis=-2)
+            Tredjepladser = np.take_along_axis(Treere, Rangorden(TreerTabel, self.Kort[Treere]), axis=-1)
+
+            Runder = np.zeros((AntalScenarier,) + Model['bRunder'].shape[1:], dtype=np.float32)
+            Ottendedelsfinalister = BestemOttendedelsfinaler(Placeringer, Tredjepladser).reshape(AntalScenarier, -1)
+            Runder[np.arange(AntalScenarier)[:, None], 0, Ottendedelsfinalister] = 1
+            SlutspilPoint = BeregnSlutspilPoint(Runder, Model['bRunder'], Model['SlutspilVægte'])
+
+        # Rangeres som i _BeregnBoisStilling for hvert scenarie
+        Point = GrupperPoint + BonusPoint + SlutspilPoint
+        Bois = np.arange(AntalBois)
+        Rækkefølge = np.lexsort((np.broadcast_to(Bois, Point.shape), -GrupperPoint, -(GrupperPoint + BonusPoint), -Point))
+
+        return pd.DataFrame({
+            'Boi': np.array(self.GrupperBudBois, dtype=object)[Rækkefølge].ravel(),
+            'Point': np.take_along_axis(Point, Rækkefølge, axis=1).ravel()
+        }, index=pd.MultiIndex.from_product([np.arange(AntalScenarier), Bois], names=['Scenarie', None]))
+
+    def _BeregnIndflydelse(self, MaksMål=5):
+        # Beregner for hver resterende gruppekamp hvor meget den kan flytte rundt på stillingen for bois
+        Model = self._LavSimuleringsModel()
+        Scorer = ScenarieGitter(1, MaksMål)[:, 0]
+        RestHold = Model['RestHold']
+
+        # Sandsynligheden for hvert resultat op til MaksMål-MaksMål fra simuleringens målmodel
+        λ = Model['μ'] * Model['Angreb'][RestHold] * Model['Forsvar'][RestHold[:, ::-1]]
+        Fordeling = stats.poisson.pmf(Scorer[None], λ[:, None]).prod(axis=-1) # Formen (kampe, resultater)
+        Fordeling /= Fordeling.sum(axis=1, keepdims=True)
+
+        # Placeringer nu og efter hvert resultat i hver kamp, alle kampe og resultater rangeres i ét kald
+        Nu = self.BoisStilling.set_index('Boi')['Point'].reindex(self.GrupperBudBois).to_numpy()
+        Ekstra = BeregnKampPoint(Model['bRestMål'].transpose(1, 0, 2)[:, None], Scorer[None, :, None]) * Model['bRestGyldig'].T[:, None]
+        Point = (Nu + Ekstra).reshape(-1, len(Nu)) # Formen (kampe * resultater, bois)
+        Flytning = np.abs(AntalOver(Point, Point) - AntalOver(Nu[None], Nu[None])).mean(axis=1).reshape(len(RestHold), len(Scorer))
+
+        Hold = np.array(self.Hold)
+        self.KampIndflydelse = pd.DataFrame({
+            'Hold 1': Hold[RestHold[:, 0]],
+            'Hold 2': Hold[RestHold[:, 1]],
+            'Forventet flytning': (Fordeling * Flytning).sum(axis=1), # Gennemsnitlig ændring i placering pr. boi
+            'Største flytning': Flytning.max(axis=1, initial=0)
+        }).sort_values('Forventet flytning', ascending=False, kind='stable')
+
+        return self.KampIndflydelse
+
+    def _OptimerBud(self, MaksMål=10, AntalTurneringer=20000, Frø=2024, KandidaterPrUdfald=2):
+        # Finder bud på alle gruppekampe med flest forventede point ud fra simuleringens målmodel, spillede kampe er kendte
+        Model = self._LavSimuleringsModel()
+        rng = np.random.default_rng(Frø)
+
+        # Sandsynligheden for hvert resultat op til MaksMål-MaksMål, med uafhængige Poisson-fordelte mål
+        λ = Model['μ'] * Model['Angreb'][self.Kampe] * Model['Forsvar'][self.Kampe[:, ::-1]]
+        Fordeling = stats.poisson.pmf(np.arange(MaksMål + 1), λ[..., None]) # Formen (kampe, 2, mål)
+        Sandsynligheder = Fordeling[:, 0, :, None] * Fordeling[:, 1, None, :]
+
+        Kamp, Vendt = FindKampe(self.GrupperResultaterHold, self.KampOpslag, self.Kampe)
+        Mål = np.where(Vendt[:, None], self.GrupperResultaterMål[:, ::-1], self.GrupperResultaterMål)
+        Spillede = Kamp >= 0
+        Sandsynligheder[Kamp[Spillede]] = 0
+        Mål = np.minimum(Mål[Spillede], MaksMål)
+        Sandsynligheder[Kamp[Spillede], Mål[:, 0], Mål[:, 1]] = 1
+        Sandsynligheder /= Sandsynligheder.sum(axis=(1, 2), keepdims=True) # Resultater over MaksMål fordeles på resten
+
+        # Sandsynligheden for at hvert hold vinder sin gruppe, fra simulerede resterende gruppekampe
+        RestHold = Model['RestHold']
+        λ = Model['μ'] * Model['Angreb'][RestHold] * Model['Forsvar'][RestHold[:, ::-1]]
+        RestMål = stats.poisson.rvs(λ, size=(AntalTurneringer,) + λ.shape, random_state=rng)
+        Placeringer, _ = RangerGrupper(Model['StillingTabel'] + BeregnTabel(RestHold, RestMål, len(self.Hold)), self.GruppeHold, self.Kort)
+        Vinder = np.bincount(Placeringer[..., 0].ravel(), minlength=len(self.Hold)) / AntalTurneringer
+
+        Bud, Forventet, Vindere = OptimerBud(
+            Sandsynligheder, self.Kampe, self.GruppeHold, self.Kort, Vinder, Model['Bonus'], KandidaterPrUdfald
+        )
 
-            
+        Hold = np.array(self.Hold)
+        self.OptimaleBud = pd.DataFrame({
+            'Hold 1': Hold[self.Kampe[:, 0]],
+            'Hold 2': Hold[self.Kampe[:, 1]],
+            'Mål 1': Bud[:, 0],
+            'Mål 2': Bud[:, 1],
+            'Forventede point': Forventet
+        })
+        self.OptimaleBud.attrs['Gruppevindere'] = pd.DataFrame({
+            'Gruppevinder': Hold[Vindere],
+            'Sandsynlighed': Vinder[Vindere],
+            'Forventet bonus': Model['Bonus'] * Vinder[Vindere]
+        }, index=list(self.Grupper))
+
+        return self.OptimaleBud
+
+    def _LavSide(self):
+        # Laver en samlet side med alle visninger og ét fælles stylesheet
+        html = "<!DOCTYPE html>\n<html>\n<head>\n<meta charset='utf-8'>\n<title>TBTF Euro</title>\n" + DiffStil + "</head>\n<body>\n"
+        html += self._HentHtml(('BoisStilling',), ['_BeregnBoisStilling'], self._LavBoisStillingHtml)
+        html += self._HentHtml(('GrupperStilling',), ['_LavGrupperStilling'], self._LavGrupperStillingHtml)
+
+        for boi in self.GrupperBudBois:
+            html += self._HentHtml(
+                ('GrupperStillingBoisDiff', boi), ['_BeregnStillingDiff'], lambda: self._LavGrupperStillingBoisDiffHtml(boi)
+            )
+
+        return html + "</body>\n</html>\n"
+
+    def _EksporterHtml(self, Mappe='Eksport'):
+        # Gemmer den samlede side og stillingerne som statiske filer til en hjemmeside
+        Mappe = os.path.join(self.Mappe, Mappe)
+        os.makedirs(Mappe, exist_ok=True)
+
+        with open(os.path.join(Mappe, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(self._LavSide())
+
+        Data = {
+            'Version': self._Versioner,
+            'BoisStilling': self.BoisStilling.to_dict('records'),
+            'Gruppestillinger': {gruppe: df.to_dict('index') for gruppe, df in self.StillingGrupper.items()},
+            'Fragmenter': {' '.join(Nøgle): html for Nøgle, (_, html) in self._HtmlCache.items()}
+        }
+        with open(os.path.join(Mappe, 'data.json'), 'w', encoding='utf-8') as f:
+            json.dump(Data, f, ensure_ascii=False, default=int)
+
+    def _GemDatabase(self, Sti='TBTFEuro.sqlite'):
+        # Gemmer hold, kampe, resultater, bud og point i en SQLite-database, som andre processer kan læse med HentStilling og HentBoi
+        # Kun nye resultater og ændrede bud skrives, og hver gemning er én transaktion
+        Forbindelse = ÅbnDatabase(os.path.join(self.Mappe, Sti))
+        Meta = dict(Forbindelse.execute('SELECT Nøgle, Værdi FROM Meta'))
+
+        with Forbindelse:
+            GruppeAf = {land: gruppe for gruppe, lande in self.Grupper.items() for land in lande}
+            Forbindelse.executemany('INSERT OR REPLACE INTO Hold VALUES (?, ?, ?)', [(h, land, GruppeAf[land]) for h, land in enumerate(self.Hold)])
+            Forbindelse.executemany('INSERT OR REPLACE INTO Kampe VALUES (?, ?, ?)', [(k, int(Hold1), int(Hold2)) for k, (Hold1, Hold2) in enumerate(self.Kampe)])
+
+            # Bud skrives kun igen når de er ændret, og så skal alle point også skrives igen
+            BudNøgle = hashlib.sha256(json.dumps(self.GrupperBudBois).encode() + self.bKampMål.tobytes()).hexdigest()
+            if Meta.get('Bud') != BudNøgle:
+                for Tabel in ['Point', 'Resultater', 'Bud', 'SlutspilBud', 'SlutspilPoint', 'Stilling', 'Bois']:
+                    Forbindelse.execute(f'DELETE FROM {Tabel}')
+                Forbindelse.executemany('INSERT INTO Bois VALUES (?, ?)', enumerate(self.GrupperBudBois))
+                b, k = np.nonzero(self.bKampMål[..., 0] >= 0)
+                Forbindelse.executemany('INSERT INTO Bud VALUES (?, ?, ?, ?)', zip(b.tolist(), k.tolist(), *self.bKampMål[b, k].T.tolist()))
+                Meta = {} # Alt der henviser til bois skrives igen
+
+            Indeks = pd.Index(self.SlutspilBudBois).get_indexer(self.GrupperBudBois)
+            SlutspilNøgle = hashlib.sha256(Indeks.tobytes() + self.SlutspilBudMasker.tobytes()).hexdigest()
+            if Meta.get('SlutspilBud') != SlutspilNøgle:
+                Forbindelse.execute('DELETE FROM SlutspilBud')
+                Masker = np.where(Indeks[:, None] >= 0, self.SlutspilBudMasker[Indeks], 0).astype(self.SlutspilBudMasker.dtype)
+                b, Runde, h = np.nonzero((Masker[..., None] >> np.arange(len(self.Hold), dtype=Masker.dtype)) & 1)
+                Forbindelse.executemany('INSERT INTO SlutspilBud VALUES (?, ?, ?)', zip(b.tolist(), Runde.tolist(), h.tolist()))
+
+            # Resultater skrives fra det første der er nyt eller ændret, med mål vendt som kampen og point for alle bois
+            Kamp, Vendt = FindKampe(self.GrupperResultaterHold, self.KampOpslag, self.Kampe)
+            Mål = np.where(Vendt[:, None], self.GrupperResultaterMål[:, ::-1], self.GrupperResultaterMål)
+            Rækker = [(r, k if k >= 0 else None, Mål1, Mål2) for r, (k, (Mål1, Mål2)) in enumerate(zip(Kamp.tolist(), Mål.tolist()))]
+            Gemte = Forbindelse.execute('SELECT * FROM Resultater ORDER BY Nummer').fetchall()
+            Fra = next((r for r, (Række, Gemt) in enumerate(zip(Rækker, Gemte)) if Række != Gemt), min(len(Rækker), len(Gemte)))
+            Forbindelse.execute('DELETE FROM Point WHERE Resultat >= ?', (Fra,))
+            Forbindelse.execute('DELETE FROM Resultater WHERE Nummer >= ?', (Fra,))
+            Forbindelse.executemany('INSERT INTO Resultater VALUES (?, ?, ?, ?)', Rækker[Fra:])
+
+            b, r = np.nonzero(~np.isnan(self.GrupperBoisPointMatrix[:, Fra:])) # Kampe uden bud har ingen point
+            Forbindelse.executemany('INSERT INTO Point VALUES (?, ?, ?)', zip(b.tolist(), (r + Fra).tolist(), self.GrupperBoisPointMatrix[b, r + Fra].astype(int).tolist()))
+            self._Tæl('Resultater gemt', len(Rækker) - Fra)
+
+            # Slutspilspoint og stillingen er små og skrives hver gang
+            SlutspilPoint = np.where(Indeks[:, None] >= 0, self.SlutspilBoisPointMatrix[Indeks], 0)
+            b, Runde = np.nonzero(SlutspilPoint)
+            Forbindelse.execute('DELETE FROM SlutspilPoint')
+            Forbindelse.executemany('INSERT INTO SlutspilPoint VALUES (?, ?, ?)', zip(b.tolist(), Runde.tolist(), SlutspilPoint[b, Runde].tolist()))
+
+            BoisIndeks = pd.Index(self.GrupperBudBois)
+            GrupperPoint = np.nansum(self.GrupperBoisPointMatrix, axis=1).astype(int)
+            Bonus = np.array([self.bKorrekteGruppevindere[boi] for boi in self.GrupperBudBois], dtype=int)
+            Forbindelse.execute('DELETE FROM Stilling')
+            Forbindelse.executemany('INSERT INTO Stilling VALUES (?, ?, ?, ?, ?, ?)', [
+                (b, Placering, Point, int(GrupperPoint[b]), int(Bonus[b]), int(SlutspilPoint[b].sum()))
+                for Placering, (b, Point) in enumerate(zip(BoisIndeks.get_indexer(self.BoisStilling['Boi']).tolist(), self.BoisStilling['Point'].tolist()))
+            ])
+
+            Forbindelse.executemany('INSERT OR REPLACE INTO Meta VALUES (?, ?)', [('Bud', BudNøgle), ('SlutspilBud', SlutspilNøgle)])
+        Forbindelse.close()
+
+    def _FilTilstand(self, Fil):
+        # Ændringstid og størrelse for en inputfil, None hvis den ikke findes
+        try:
+            Info = os.stat(os.path.join(self.Mappe, self.Filer[Fil]))
+        except FileNotFoundError:
+            return None
+        return Info.st_mtime_ns, Info.st_size
+
+    def _OpdaterFil(self, Fil):
+        # Indlæser en ændret fil igen og nulstiller kun de trin der afhænger af den
+        if Fil == 'Resultater' and '_ImporterGrupperResultater' in self._Beregnet:
+            Gamle = self.GrupperResultater
+            Nye = self._LæsGrupperResultater().to_dict(orient='records')
+            if Nye[:len(Gamle)] == Gamle: # Nye kampe sidst i filen lægges til uden at genberegne resten
+                for kamp in Nye[len(Gamle):]:
+                    self._TilføjGrupperResultat(kamp['Hold 1'], kamp['Hold 2'], kamp['Mål 1'], kamp['Mål 2'])
+                return
+
+        self._Nulstil(OvervågedeFiler[Fil])
+
+    def _LavOpdatering(self, Filer):
+        # Samler stillingen og gruppetabellerne der sendes til abonnenter efter en ændring
+        return {
+            'Filer': [self.Filer[Fil] for Fil in Filer],
+            'BoisStilling': self.BoisStilling.to_dict('records'),
+            'Gruppestillinger': {gruppe: df.to_dict('index') for gruppe, df in self.StillingGrupper.items()},
+            'Html': self._HentHtml(('BoisStilling',), ['_BeregnBoisStilling'], self._LavBoisStillingHtml) +
+                    self._HentHtml(('GrupperStilling',), ['_LavGrupperStilling'], self._LavGrupperStillingHtml)
+        }
+
+    def _LavLiveVisning(self):
+        # Viser stillingen i notebooken og returnerer en abonnent der opdaterer visningen på stedet
+        Håndtag = display(HTML(self._LavOpdatering([])['Html']), display_id=True)
+        return lambda Opdatering: Håndtag.update(HTML(Opdatering['Html'])) if 'Html' in Opdatering else None
+
+    async def _StartServer(self, Port, Vært='127.0.0.1'):
+        # Starter en lille HTTP-server med en live side på / og server-sent events på /begivenheder
+        Klienter = set()
+
+        async def Håndter(Læser, Skriver):
+            Anmodning = (await Læser.readline()).decode('latin-1').split()
+            while (await Læser.readline()) not in (b'\r\n', b'\n', b''): # Springer headers over
+                pass
+
+            try:
+                if len(Anmodning) > 1 and Anmodning[1] == '/begivenheder':
+                    Skriver.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n\r\n')
+                    await Skriver.drain()
+                    Kø = asyncio.Queue()
+                    Klienter.add(Kø)
+                    try:
+                        while (Data := await Kø.get()) is not None: # None lukker forbindelsen når overvågningen stopper
+                            Skriver.write(f'data: {Data}\n\n'.encode('utf-8'))
+                            await Skriver.drain()
+                    finally:
+                        Klienter.discard(Kø)
+                else:
+                    try:
+                        Status, Side = b'200 OK', LiveSide.format(html=self._LavOpdatering([])['Html']).encode('utf-8')
+                    except Exception as Fejl: # Fx en inputfil der ikke kan læses
+                        Status, Side = b'500 Internal Server Error', repr(Fejl).encode('utf-8')
+                    Skriver.write(b'HTTP/1.1 %s\r\nContent-Type: text/html; charset=utf-8\r\nContent-Length: %d\r\n\r\n' % (Status, len(Side)) + Side)
+                    await Skriver.drain()
+            except ConnectionError: # Klienten har lukket forbindelsen
+                pass
+            finally:
+                Skriver.close()
+
+        def Send(Opdatering):
+            Data = None if Opdatering is None else json.dumps(Opdatering, ensure_ascii=False, default=int)
+            for Kø in Klienter:
+                Kø.put_nowait(Data)
+
+        Server = await asyncio.start_server(Håndter, Vært, Port)
+        return Server, Send
+
+    async def _Overvåg(self, Abonnenter=(), Interval=0.1, Ventetid=0.2, Port=None, Stop=None):
+        # Overvåger inputfilerne og sender ny stilling til abonnenter, indtil Stop (en asyncio.Event) sættes
+        Abonnenter = list(Abonnenter)
+        Server = None
+        if Port is not None:
+            Server, Send = await self._StartServer(Port)
+            Abonnenter.append(Send)
+
+        Tilstand = {Fil: self._FilTilstand(Fil) for Fil in OvervågedeFiler}
+        try:
+            while Stop is None or not Stop.is_set():
+                await asyncio.sleep(Interval)
+                Ændrede = [Fil for Fil in OvervågedeFiler if self._FilTilstand(Fil) != Tilstand[Fil]]
+                if not Ændrede:
+                    continue
+
+                # Venter til filerne er færdigskrevet, så en gemning kun giver én opdatering
+                while True:
+                    Før = [self._FilTilstand(Fil) for Fil in Ændrede]
+                    await asyncio.sleep(Ventetid)
+                    if [self._FilTilstand(Fil) for Fil in Ændrede] == Før:
+                        break
+
+                try:
+                    for Fil in Ændrede:
+                        Tilstand[Fil] = self._FilTilstand(Fil)
+                        self._OpdaterFil(Fil)
+                    Opdatering = self._LavOpdatering(Ændrede)
+                except Exception as Fejl: # En fil med fejl stopper ikke overvågningen, den læses igen ved næste ændring
+                    for Fil in Ændrede:
+                        self._Nulstil(OvervågedeFiler[Fil])
+                    Opdatering = {'Filer': [self.Filer[Fil] for Fil in Ændrede], 'Fejl': repr(Fejl)}
+
+                for Abonnent in Abonnenter:
+                    Svar = Abonnent(Opdatering)
+                    if asyncio.iscoroutine(Svar):
+                        await Svar
+        finally:
+            if Server is not None:
+                Send(None)
+                await asyncio.sleep(0) # Lader forbindelserne lukke før serveren
+                Server.close()
+                await Server.wait_closed()
+
+def ScorPulje(Konfiguration, Fælles):
+    # Scorer én pulje med resultaterne der er beregnet på forhånd, kører i en separat proces
+    Turnering = TBTFEuro(Konfiguration=Konfiguration)
+    Turnering._IndsætTrin(Fælles, ResultatTrin)
+    return Turnering.BoisStilling
+
+def KørPuljer(Kilde, AntalProcesser=None):
+    # Scorer flere puljer mod de samme resultater, med en proces pr. pulje
+    # Kilde er en JSON-fil eller et dict med fælles indstillinger og en liste 'Puljer' med det der er særligt for hver pulje
+    Konfiguration = LæsKonfiguration(Kilde)
+    Puljer = Konfiguration.pop('Puljer', [])
+    Mappe = Konfiguration.get('Mappe') or os.getcwd()
+
+    # Resultaterne læses og stillingen i grupper og slutspil beregnes kun én gang
+    Fælles = TBTFEuro(Konfiguration=Konfiguration)._HentTrin(ResultatTrin)
+
+    Konfigurationer = []
+    for i, Pulje in enumerate(Puljer):
+        PuljeKonfiguration = {
+            **Konfiguration, **Pulje,
+            'Mappe': os.path.join(Mappe, Pulje.get('Mappe', '.')),
+            'Filer': {**Konfiguration['Filer'], **Pulje.get('Filer', {})},
+            'Point': {**Konfiguration['Point'], **Pulje.get('Point', {})}
+        }
+        PuljeKonfiguration.setdefault('Navn', f'Pulje {i + 1}')
+        Konfigurationer.append(PuljeKonfiguration)
 
+    if AntalProcesser == 1:
+        Stillinger = list(map(ScorPulje, Konfigurationer, repeat(Fælles)))
+    else:
+        with ProcessPoolExecutor(AntalProcesser) as pulje:
+            Stillinger = list(pulje.map(ScorPulje, Konfigurationer, repeat(Fælles)))
 
+    return {PuljeKonfiguration['Navn']: Stilling for PuljeKonfiguration, Stilling in zip(Konfigurationer, Stillinger)}